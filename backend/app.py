@@ -3,68 +3,148 @@ Flask API Server for Google Meet Transcript Downloader
 Provides REST API endpoints for the React frontend
 """
 
-import os
+import io
 import sys
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from flask import Flask, request, jsonify, send_file
+from typing import List, Dict, Any, Optional, Union
+from flask import Flask, Response, request, jsonify, send_file
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
 import json
+import orjson
+from cachetools import TTLCache
 
 from google_auth import GoogleAuthManager
 from google_calendar import GoogleCalendarIntegration
 from google_meet import GoogleMeetIntegration
 from google_drive import GoogleDriveIntegration
 
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson cannot serialize natively"""
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode('utf-8', errors='replace')
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson for faster response serialization"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default).decode('utf-8')
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        # Hand orjson's bytes straight to the response to skip a decode/encode pass
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default), mimetype='application/json'
+        )
+
 app = Flask(__name__)
-CORS(app)  # Enable CORS for React frontend
+app.json = OrjsonProvider(app)
+# Enable CORS for React frontend; preflight OPTIONS requests are answered by
+# Flask-CORS directly and may be cached by the browser for 10 minutes
+CORS(app, send_wildcard=True, automatic_options=True, max_age=600)
+
+# Compress JSON responses for clients that send Accept-Encoding
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 4
+Compress(app)
+
+class ServiceRegistry:
+    """Holds the Google service integrations shared by request handlers"""
+    
+    __slots__ = ('auth', 'calendar', 'meet', 'drive', 'ready', 'initializing', 'lock')
+    
+    def __init__(self, lock: threading.Lock):
+        self.auth: Optional[GoogleAuthManager] = None
+        self.calendar: Optional[GoogleCalendarIntegration] = None
+        self.meet: Optional[GoogleMeetIntegration] = None
+        self.drive: Optional[GoogleDriveIntegration] = None
+        self.ready = False  # Set once every integration is initialized
+        # Set by the request running the sign-in flow; other logins wait on it instead of starting another
+        self.initializing: Optional[threading.Event] = None
+        self.lock = lock  # Guards the fields above; never held during the OAuth flow
 
-# Global instances
-auth_manager = None
-calendar_integration = None
-meet_integration = None
-drive_integration = None
-is_authenticated = False
+app.extensions['gmeet'] = ServiceRegistry(lock=threading.Lock())
+
+# Serialized /api/meetings bodies keyed by (months_back, minute bucket), so UI
+# polling is answered without rebuilding or re-encoding the meeting list
+_meetings_response_cache = TTLCache(maxsize=64, ttl=60)
+_response_cache_lock = threading.Lock()
+
+# Most meetings one bulk transcript request may ask for, bounding the batch calls it fans out to
+MAX_BULK_MEETINGS = 50
 
 def initialize_backend():
     """Initialize the backend services"""
-    global auth_manager, calendar_integration, meet_integration, drive_integration, is_authenticated
+    reg = app.extensions['gmeet']
+    
+    with reg.lock:
+        if reg.ready:
+            return True
+        pending = reg.initializing
+        if pending is None:
+            reg.initializing = threading.Event()
+    
+    if pending is not None:
+        # Another request is running the sign-in flow; wait for its outcome without holding the lock
+        pending.wait()
+        return reg.ready
     
     try:
-        auth_manager = GoogleAuthManager()
-        meet_integration = GoogleMeetIntegration()
+        # The OAuth flow may wait on the user's browser, so services are built outside the lock
+        auth = GoogleAuthManager()
+        meet = GoogleMeetIntegration()
         
-        if auth_manager.authenticate():
-            calendar_integration = GoogleCalendarIntegration(
-                auth_manager.get_calendar_service()
-            )
-            drive_integration = GoogleDriveIntegration(
-                auth_manager.get_drive_service()
-            )
-            is_authenticated = True
-            return True
-        else:
+        if not auth.authenticate():
             return False
+        
+        calendar = GoogleCalendarIntegration(
+            auth.get_calendar_service()
+        )
+        drive = GoogleDriveIntegration(
+            auth.get_drive_service(),
+            account_key=auth.get_account_key()
+        )
+        
+        with reg.lock:
+            reg.auth, reg.meet, reg.calendar, reg.drive = auth, meet, calendar, drive
+            reg.ready = True
+        return True
     except Exception as e:
         print(f"Error initializing backend: {e}")
         return False
+    finally:
+        with reg.lock:
+            done, reg.initializing = reg.initializing, None
+        done.set()
+
+def _clear_response_cache():
+    """Drop pre-serialized API responses"""
+    with _response_cache_lock:
+        _meetings_response_cache.clear()
 
 @app.route('/api/auth/status', methods=['GET'])
 def get_auth_status():
     """Check authentication status"""
-    global is_authenticated
+    reg = app.extensions['gmeet']
     return jsonify({
-        'authenticated': is_authenticated,
-        'message': 'Authenticated' if is_authenticated else 'Not authenticated'
+        'authenticated': reg.ready,
+        'message': 'Authenticated' if reg.ready else 'Not authenticated'
     })
 
 @app.route('/api/auth/login', methods=['POST'])
 def login():
     """Initiate Google authentication"""
-    global is_authenticated
+    reg = app.extensions['gmeet']
     
     try:
-        if not is_authenticated:
+        if not reg.ready:
             success = initialize_backend()
             if success:
                 return jsonify({
@@ -90,9 +170,9 @@ def login():
 @app.route('/api/meetings', methods=['GET'])
 def get_meetings():
     """Get list of meetings from Google Calendar"""
-    global calendar_integration, is_authenticated
+    reg = app.extensions['gmeet']
     
-    if not is_authenticated or not calendar_integration:
+    if not reg.ready:
         return jsonify({
             'success': False,
             'message': 'Not authenticated'
@@ -100,35 +180,57 @@ def get_meetings():
     
     try:
         # Get meetings from the past 3 months
-        meetings = calendar_integration.get_upcoming_meetings(months_back=3)
+        months_back = 3
+        cache_key = (months_back, int(time.time() // 60))
+        with _response_cache_lock:
+            body = _meetings_response_cache.get(cache_key)
         
-        # Convert datetime objects to strings for JSON serialization
-        serialized_meetings = []
-        for meeting in meetings:
-            serialized_meeting = meeting.copy()
-            if meeting['start_time']:
-                serialized_meeting['start_time'] = meeting['start_time'].isoformat()
-            if meeting['end_time']:
-                serialized_meeting['end_time'] = meeting['end_time'].isoformat()
-            serialized_meetings.append(serialized_meeting)
+        if body is None:
+            meetings = reg.calendar.get_upcoming_meetings(months_back=months_back)
+            
+            # datetime fields are serialized natively by orjson
+            body = orjson.dumps({
+                'success': True,
+                'meetings': meetings,
+                'count': len(meetings)
+            }, default=_default)
+            
+            # An empty list may be a failed fetch, so don't hold on to it
+            if meetings:
+                with _response_cache_lock:
+                    _meetings_response_cache[cache_key] = body
         
-        return jsonify({
-            'success': True,
-            'meetings': serialized_meetings,
-            'count': len(serialized_meetings)
-        })
+        return Response(body, mimetype='application/json')
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Error fetching meetings: {str(e)}'
         }), 500
 
+@app.route('/api/meetings/refresh', methods=['POST'])
+def refresh_meetings():
+    """Invalidate cached calendar data so the next listing hits the API"""
+    reg = app.extensions['gmeet']
+    
+    if not reg.ready:
+        return jsonify({
+            'success': False,
+            'message': 'Not authenticated'
+        }), 401
+    
+    reg.calendar.invalidate_cache()
+    _clear_response_cache()
+    return jsonify({
+        'success': True,
+        'message': 'Meeting cache cleared'
+    })
+
 @app.route('/api/meetings/<meeting_id>/transcripts', methods=['GET'])
 def get_meeting_transcripts(meeting_id):
     """Get available transcripts for a specific meeting"""
-    global calendar_integration, meet_integration, drive_integration, is_authenticated
+    reg = app.extensions['gmeet']
     
-    if not is_authenticated or not all([calendar_integration, meet_integration, drive_integration]):
+    if not reg.ready:
         return jsonify({
             'success': False,
             'message': 'Not authenticated'
@@ -136,7 +238,7 @@ def get_meeting_transcripts(meeting_id):
     
     try:
         # Get meeting details
-        meeting = calendar_integration.get_meeting_by_id(meeting_id)
+        meeting = reg.calendar.get_meeting_by_id(meeting_id)
         if not meeting:
             return jsonify({
                 'success': False,
@@ -144,7 +246,7 @@ def get_meeting_transcripts(meeting_id):
             }), 404
         
         # Extract meeting code from URL
-        meeting_code = meet_integration.extract_meeting_code_from_url(meeting['meet_link'])
+        meeting_code = reg.meet.extract_meeting_code_from_url(meeting['meet_link'])
         if not meeting_code:
             return jsonify({
                 'success': False,
@@ -152,25 +254,79 @@ def get_meeting_transcripts(meeting_id):
             }), 400
         
         # Search for transcripts
-        transcripts = drive_integration.search_meeting_transcripts(
+        transcripts = reg.drive.search_meeting_transcripts(
             meeting_code=meeting_code,
             meeting_title=meeting['title'],
             meeting_date=meeting['start_time']
         )
         
-        # Serialize transcript data
-        serialized_transcripts = []
-        for transcript in transcripts:
-            serialized_transcript = transcript.copy()
-            if transcript.get('meeting_date'):
-                serialized_transcript['meeting_date'] = str(transcript['meeting_date'])
-            serialized_transcripts.append(serialized_transcript)
-        
         return jsonify({
             'success': True,
             'meeting': meeting,
-            'transcripts': serialized_transcripts,
-            'count': len(serialized_transcripts)
+            'transcripts': transcripts,
+            'count': len(transcripts)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching transcripts: {str(e)}'
+        }), 500
+
+@app.route('/api/meetings/transcripts/bulk', methods=['POST'])
+def get_bulk_meeting_transcripts():
+    """Get available transcripts for several meetings in one request"""
+    reg = app.extensions['gmeet']
+    
+    if not reg.ready:
+        return jsonify({
+            'success': False,
+            'message': 'Not authenticated'
+        }), 401
+    
+    data = request.get_json(silent=True) or {}
+    meeting_ids = data.get('meeting_ids')
+    if (not isinstance(meeting_ids, list) or not meeting_ids
+            or not all(isinstance(meeting_id, str) and meeting_id for meeting_id in meeting_ids)):
+        return jsonify({
+            'success': False,
+            'message': 'meeting_ids must be a non-empty list of meeting ID strings'
+        }), 400
+    if len(meeting_ids) > MAX_BULK_MEETINGS:
+        return jsonify({
+            'success': False,
+            'message': f'At most {MAX_BULK_MEETINGS} meeting_ids may be requested at once'
+        }), 400
+    
+    try:
+        # Fetch all meeting details in a single batched Calendar request
+        meetings = reg.calendar.get_meetings_by_ids(meeting_ids)
+        
+        # Only meetings with a valid Meet link are searched, as in the single-meeting endpoint
+        searchable_ids = {
+            meeting['id'] for meeting in meetings
+            if reg.meet.extract_meeting_code_from_url(meeting['meet_link'])
+        }
+        
+        # Search Drive for every meeting's transcripts in one query
+        transcripts_by_title = reg.drive.search_transcripts_for_meetings(
+            [meeting['title'] for meeting in meetings if meeting['id'] in searchable_ids]
+        )
+        
+        results = []
+        for meeting in meetings:
+            transcripts = []
+            if meeting['id'] in searchable_ids:
+                transcripts = transcripts_by_title.get(meeting['title'], [])
+            results.append({
+                'meeting': meeting,
+                'transcripts': transcripts,
+                'count': len(transcripts)
+            })
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'count': len(results)
         })
     except Exception as e:
         return jsonify({
@@ -181,16 +337,16 @@ def get_meeting_transcripts(meeting_id):
 @app.route('/api/transcripts/<file_id>/content', methods=['GET'])
 def get_transcript_content(file_id):
     """Get transcript content for display"""
-    global drive_integration, is_authenticated
+    reg = app.extensions['gmeet']
     
-    if not is_authenticated or not drive_integration:
+    if not reg.ready:
         return jsonify({
             'success': False,
             'message': 'Not authenticated'
         }), 401
     
     try:
-        content = drive_integration.get_transcript_content(file_id)
+        content = reg.drive.get_transcript_content(file_id)
         if content:
             return jsonify({
                 'success': True,
@@ -211,30 +367,23 @@ def get_transcript_content(file_id):
 @app.route('/api/transcripts/<file_id>/download', methods=['GET'])
 def download_transcript(file_id):
     """Download transcript file"""
-    global drive_integration, is_authenticated
+    reg = app.extensions['gmeet']
     
-    if not is_authenticated or not drive_integration:
+    if not reg.ready:
         return jsonify({
             'success': False,
             'message': 'Not authenticated'
         }), 401
     
     try:
-        # Get file metadata first
-        file_metadata = drive_integration.drive_service.files().get(fileId=file_id).execute()
-        filename = file_metadata.get('name', 'transcript.docx')
-        
-        # Create a temporary filename for download
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        temp_filename = f"temp_{timestamp}_{filename}"
-        temp_path = f"transcripts/{temp_filename}"
+        # Download straight into memory and stream it back without touching disk
+        buffer = io.BytesIO()
+        filename = reg.drive.download_transcript(file_id, fileobj=buffer)
         
-        # Download the file
-        downloaded_path = drive_integration.download_transcript(file_id, temp_path)
-        
-        if downloaded_path and os.path.exists(downloaded_path):
+        if filename:
+            buffer.seek(0)
             return send_file(
-                downloaded_path,
+                buffer,
                 as_attachment=True,
                 download_name=filename,
                 mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
@@ -250,6 +399,26 @@ def download_transcript(file_id):
             'message': f'Error downloading transcript: {str(e)}'
         }), 500
 
+@app.route('/api/cache/clear', methods=['POST'])
+def clear_cache():
+    """Clear cached calendar data and transcript content"""
+    reg = app.extensions['gmeet']
+    
+    if not reg.ready:
+        return jsonify({
+            'success': False,
+            'message': 'Not authenticated'
+        }), 401
+    
+    reg.calendar.invalidate_cache()
+    _clear_response_cache()
+    reg.drive.clear_cache()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Cache cleared'
+    })
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -259,12 +428,10 @@ def health_check():
     })
 
 if __name__ == '__main__':
-    # Create transcripts directory
-    os.makedirs('transcripts', exist_ok=True)
-    
     # Start Flask app without initializing authentication
     print("Starting Google Meet Transcript API...")
     print("Authentication will be initialized when user clicks sign-in button.")
     
-    # Run Flask app
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Run Flask app; threaded so slow Google API calls don't block other requests.
+    # For production use the WSGI entrypoint in wsgi.py instead.
+    app.run(host='0.0.0.0', port=5000, threaded=True)
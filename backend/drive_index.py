@@ -0,0 +1,208 @@
+"""
+Drive File Index Module
+Keeps a local SQLite copy of a Drive folder's file listing, synced through the changes API
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Optional
+from googleapiclient.discovery import Resource
+
+# Local index location, shared between runs; one database per signed-in account so
+# files and change tokens never leak between accounts
+DRIVE_INDEX_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'gmeet', 'drive-{account}.sqlite')
+# Minimum seconds between change syncs; searches in between are answered locally
+CHANGES_SYNC_INTERVAL = 30
+
+_FILE_FIELDS = "id, name, mimeType, size, createdTime, modifiedTime, webViewLink, parents, trashed"
+_CHANGES_FIELDS = f"nextPageToken, newStartPageToken, changes(fileId, removed, file({_FILE_FIELDS}))"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    mime_type TEXT,
+    size INTEGER,
+    created_time TEXT,
+    modified_time TEXT,
+    web_view_link TEXT,
+    parent TEXT,
+    last_seen REAL
+);
+CREATE INDEX IF NOT EXISTS files_parent ON files (parent);
+CREATE TABLE IF NOT EXISTS folders (
+    folder_id TEXT PRIMARY KEY,
+    page_token TEXT
+);
+"""
+
+class DriveFileIndex:
+    """Local index of the files in tracked Drive folders"""
+    
+    def __init__(self, drive_service: Resource, account_key: str = '', path: str = DRIVE_INDEX_PATH):
+        self.drive_service = drive_service
+        path = path.format(account=account_key or 'default')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Shared by request threads; every access holds the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        # Serializes first-time folder listings, which run without holding _lock
+        self._load_lock = threading.Lock()
+        self._last_sync: Dict[str, float] = {}
+    
+    def search(self, folder_id: str, name_terms: List[str]) -> List[Dict[str, Any]]:
+        """
+        Find files in a folder whose names contain every term, after syncing recent changes
+        Args:
+            folder_id: Drive folder ID
+            name_terms: Substrings the file name must contain (case-insensitive)
+        Returns:
+            List of Drive-style file dictionaries
+        """
+        self._sync(folder_id)
+        
+        query = "SELECT * FROM files WHERE parent = ?"
+        params = [folder_id]
+        for term in name_terms:
+            query += " AND name LIKE ? ESCAPE '\\'"
+            escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        
+        return [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'mimeType': row['mime_type'],
+                'size': row['size'],
+                'createdTime': row['created_time'],
+                'modifiedTime': row['modified_time'],
+                'webViewLink': row['web_view_link']
+            }
+            for row in rows
+        ]
+    
+    def clear(self):
+        """Drop all indexed files so tracked folders are listed again on next use"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM files")
+                self._conn.execute("DELETE FROM folders")
+            self._last_sync.clear()
+    
+    def _get_page_token(self, folder_id: str) -> Optional[str]:
+        """Get a folder's stored changes page token, or None if it was never listed; call with the lock held"""
+        row = self._conn.execute(
+            "SELECT page_token FROM folders WHERE folder_id = ?", (folder_id,)
+        ).fetchone()
+        return row['page_token'] if row is not None else None
+    
+    def _sync(self, folder_id: str):
+        """
+        Bring a folder's files up to date, listing it fully the first time it is seen
+        Drive is queried without holding the lock, so other searches aren't held up by the request
+        """
+        now = time.time()
+        with self._lock:
+            if now - self._last_sync.get(folder_id, 0.0) < CHANGES_SYNC_INTERVAL:
+                return
+            page_token = self._get_page_token(folder_id)
+            if page_token is not None:
+                # Claim this sync; concurrent searches answer from the current rows meanwhile
+                self._last_sync[folder_id] = now
+        
+        if page_token is None:
+            # Nothing to answer from yet, so searches of a new folder wait for one full listing
+            with self._load_lock:
+                with self._lock:
+                    loaded = self._get_page_token(folder_id) is not None
+                if not loaded:
+                    self._load_folder(folder_id)
+                with self._lock:
+                    self._last_sync[folder_id] = time.time()
+            return
+        
+        try:
+            self._apply_changes(folder_id, page_token)
+        except Exception:
+            # Let the next search retry instead of waiting out the interval
+            with self._lock:
+                self._last_sync.pop(folder_id, None)
+            raise
+    
+    def _load_folder(self, folder_id: str):
+        """List every file in a folder and start tracking changes from this point"""
+        # Take the token before listing so no change made during the listing is missed
+        page_token = self.drive_service.changes().getStartPageToken().execute()['startPageToken']
+        
+        listed = []
+        files = self.drive_service.files()
+        request = files.list(
+            q=f"'{folder_id}' in parents and trashed = false",
+            fields=f"nextPageToken, files({_FILE_FIELDS})",
+            pageSize=1000
+        )
+        while request is not None:
+            response = request.execute()
+            listed.extend(response.get('files', []))
+            request = files.list_next(request, response)
+        
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE parent = ?", (folder_id,))
+            for file in listed:
+                self._upsert(file, folder_id)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO folders (folder_id, page_token) VALUES (?, ?)",
+                (folder_id, page_token)
+            )
+    
+    def _apply_changes(self, folder_id: str, page_token: str):
+        """Fetch Drive changes since the stored page token, then apply them in one transaction"""
+        changes = []
+        new_page_token = None
+        while page_token:
+            response = self.drive_service.changes().list(
+                pageToken=page_token,
+                fields=_CHANGES_FIELDS,
+                pageSize=1000,
+                spaces='drive'
+            ).execute()
+            changes.extend(response.get('changes', []))
+            new_page_token = response.get('newStartPageToken', new_page_token)
+            page_token = response.get('nextPageToken')
+        
+        with self._lock, self._conn:
+            for change in changes:
+                file = change.get('file')
+                if (change.get('removed') or not file or file.get('trashed')
+                        or folder_id not in file.get('parents', [])):
+                    self._conn.execute(
+                        "DELETE FROM files WHERE id = ? AND parent = ?",
+                        (change['fileId'], folder_id)
+                    )
+                else:
+                    self._upsert(file, folder_id)
+            
+            if new_page_token:
+                self._conn.execute(
+                    "UPDATE folders SET page_token = ? WHERE folder_id = ?",
+                    (new_page_token, folder_id)
+                )
+    
+    def _upsert(self, file: Dict[str, Any], folder_id: str):
+        """Insert or update one file row; call with the lock held"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                file['id'], file.get('name'), file.get('mimeType'),
+                int(file.get('size') or 0), file.get('createdTime'),
+                file.get('modifiedTime'), file.get('webViewLink'),
+                folder_id, time.time()
+            )
+        )
@@ -3,8 +3,10 @@ Google OAuth Authentication Module
 Handles authentication with Google APIs for Calendar, Meet, and Drive access
 """
 
+import hashlib
 import os
-import pickle
+import queue
+import tempfile
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
@@ -12,7 +14,18 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from dotenv import load_dotenv
+import orjson
+
+# httpx with h2 speaks HTTP/2, letting concurrent API calls share one connection
+try:
+    import h2  # noqa: F401  (required by httpx for http2=True)
+    import httpx
+except ImportError:
+    httpx = None
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +36,82 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive.readonly'
 ]
 
+# Google only gzips responses for clients whose user agent contains "gzip"
+USER_AGENT = 'gmeet/1.0 (gzip)'
+
+class GzipAuthorizedHttp(AuthorizedHttp):
+    """Authorized HTTP client that sends a gzip-enabling user agent on every request"""
+    
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        # API calls already carry a "(gzip)" user agent; batch envelopes and raw requests don't
+        headers = dict(headers) if headers else {}
+        headers.setdefault('user-agent', USER_AGENT)
+        return super().request(uri, method=method, body=body, headers=headers, **kwargs)
+
+class Http2Transport:
+    """httplib2-compatible client that sends requests over a shared HTTP/2 connection"""
+    
+    def __init__(self, timeout: int = 30):
+        self.timeout = timeout
+        # httpx.Client is thread-safe; concurrent requests become streams on one connection
+        self._client = httpx.Client(http2=True, timeout=timeout, follow_redirects=True)
+    
+    def request(self, uri, method='GET', body=None, headers=None, redirections=None,
+                connection_type=None, **kwargs):
+        """Send a request and return an (httplib2.Response, content) pair like httplib2.Http"""
+        try:
+            response = self._client.request(method, uri, content=body, headers=headers)
+            content = response.content
+        except httpx.TransportError as e:
+            # googleapiclient retries ConnectionError, but not httpx's own exceptions
+            raise ConnectionError(str(e)) from e
+        
+        info = dict(response.headers)
+        info['status'] = str(response.status_code)
+        if 'content-encoding' in info:
+            # httpx has already decoded the body; report it the way httplib2 does
+            info['-content-encoding'] = info.pop('content-encoding')
+            info['content-length'] = str(len(content))
+        return httplib2.Response(info), content
+    
+    def close(self):
+        """Close the underlying connection pool"""
+        self._client.close()
+
+class PooledHttp:
+    """httplib2-compatible client that lends each request an idle pooled httplib2.Http"""
+    
+    def __init__(self, size: int = 8, timeout: int = 30):
+        self.timeout = timeout
+        # httplib2.Http is not thread-safe, so each in-flight request gets its own client;
+        # clients go back to the pool afterwards so any thread can reuse their open connections
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+    
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=httplib2.DEFAULT_MAX_REDIRECTS, connection_type=None, **kwargs):
+        """Send a request on an idle client, creating one if all are busy"""
+        try:
+            http = self._idle.get_nowait()
+        except queue.Empty:
+            http = httplib2.Http(timeout=self.timeout)
+        try:
+            return http.request(uri, method, body=body, headers=headers, redirections=redirections,
+                                connection_type=connection_type, **kwargs)
+        finally:
+            try:
+                self._idle.put_nowait(http)
+            except queue.Full:
+                # More requests than pool slots ran at once; keep the pool bounded
+                http.close()
+    
+    def close(self):
+        """Close every idle client's connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
 class GoogleAuthManager:
     """Manages Google OAuth authentication and service initialization"""
     
@@ -30,6 +119,13 @@ class GoogleAuthManager:
         self.credentials: Optional[Credentials] = None
         self.calendar_service = None
         self.drive_service = None
+        # Stable per-account identifier, looked up once the services are built
+        self._account_key: Optional[str] = None
+        # Connections shared by every thread: one multiplexed HTTP/2 connection when httpx is
+        # available, otherwise a bounded pool of HTTP/1.1 clients. Either way reuse doesn't
+        # depend on the server keeping its threads, so the thread-per-request dev server benefits too
+        self._transport = Http2Transport(timeout=30) if httpx is not None else PooledHttp(timeout=30)
+        self._http: Optional[GzipAuthorizedHttp] = None
         
     def authenticate(self) -> bool:
         """
@@ -37,12 +133,18 @@ class GoogleAuthManager:
         Returns True if authentication successful, False otherwise
         """
         creds = None
-        token_file = 'token.pickle'
+        token_file = 'token.json'
         
         # Load existing credentials if available
         if os.path.exists(token_file):
-            with open(token_file, 'rb') as token:
-                creds = pickle.load(token)
+            try:
+                with open(token_file, 'rb') as token:
+                    creds = Credentials.from_authorized_user_info(
+                        orjson.loads(token.read()), SCOPES
+                    )
+            except Exception as e:
+                print(f"Error loading saved credentials: {e}")
+                creds = None
         
         # If there are no valid credentials, initiate OAuth flow
         if not creds or not creds.valid:
@@ -65,12 +167,24 @@ class GoogleAuthManager:
                     return False
             
             # Save credentials for future use
-            with open(token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            self._save_credentials(creds, token_file)
         
         self.credentials = creds
         return self._initialize_services()
     
+    def _save_credentials(self, creds: Credentials, token_file: str):
+        """Write credentials as JSON via a temp file and atomic rename"""
+        token_dir = os.path.dirname(os.path.abspath(token_file))
+        fd, tmp_path = tempfile.mkstemp(dir=token_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as token:
+                token.write(creds.to_json().encode('utf-8'))
+            os.replace(tmp_path, token_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
     def _get_client_config(self) -> Dict[str, Any]:
         """Get OAuth client configuration from environment variables"""
         client_id = os.getenv('GOOGLE_CLIENT_ID')
@@ -93,11 +207,34 @@ class GoogleAuthManager:
             }
         }
     
+    def _get_http(self) -> GzipAuthorizedHttp:
+        """Get the authorized HTTP client for the current credentials, reusing the shared connections"""
+        if self._http is None or self._http.credentials is not self.credentials:
+            self._http = GzipAuthorizedHttp(self.credentials, http=self._transport)
+        return self._http
+    
+    def _build_request(self, http, *args, **kwargs) -> HttpRequest:
+        """Request builder that routes every API call through the shared HTTP client"""
+        return HttpRequest(self._get_http(), *args, **kwargs)
+    
     def _initialize_services(self) -> bool:
         """Initialize Google API services"""
         try:
-            self.calendar_service = build('calendar', 'v3', credentials=self.credentials)
-            self.drive_service = build('drive', 'v3', credentials=self.credentials)
+            self.calendar_service = build(
+                'calendar', 'v3',
+                http=self._get_http(),
+                requestBuilder=self._build_request,
+                static_discovery=True
+            )
+            self.drive_service = build(
+                'drive', 'v3',
+                http=self._get_http(),
+                requestBuilder=self._build_request,
+                static_discovery=True
+            )
+            # Resolve the account now so a failure surfaces at sign-in, not in a cache lookup
+            self._account_key = None
+            self.get_account_key()
             return True
         except Exception as e:
             print(f"Error initializing services: {e}")
@@ -111,6 +248,31 @@ class GoogleAuthManager:
         """Get Google Drive service instance"""
         return self.drive_service
     
+    def get_account_key(self) -> str:
+        """
+        Get a stable identifier for the signed-in account, used to keep per-account caches apart
+        Raises RuntimeError if not authenticated or the account cannot be identified
+        Returns:
+            Hash of the account's Drive permission ID, which survives token refreshes
+        """
+        if self._account_key is None:
+            if self.drive_service is None:
+                raise RuntimeError("Not authenticated with Google")
+            about = self.drive_service.about().get(fields='user(permissionId)').execute()
+            permission_id = (about.get('user') or {}).get('permissionId')
+            if not permission_id:
+                raise RuntimeError("Could not identify the signed-in Google account")
+            self._account_key = hashlib.sha256(permission_id.encode('utf-8')).hexdigest()[:16]
+        return self._account_key
+    
+    def get_access_token(self) -> Optional[str]:
+        """Get a valid OAuth access token, refreshing it if it has expired"""
+        if self.credentials is None:
+            return None
+        if not self.credentials.valid:
+            self.credentials.refresh(Request())
+        return self.credentials.token
+    
     
     def is_authenticated(self) -> bool:
         """Check if user is authenticated"""
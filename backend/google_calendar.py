@@ -3,44 +3,122 @@ Google Calendar Integration Module
 Handles fetching meetings from Google Calendar
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import functools
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from cachetools import TTLCache
 from googleapiclient.discovery import Resource
 
+# ciso8601 is a C parser that is much faster than datetime.fromisoformat
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+# Event fields read by _extract_meeting_info; requested via partial responses
+_EVENT_FIELDS = (
+    'id,summary,description,location,start,end,'
+    'conferenceData/entryPoints(entryPointType,uri),'
+    'attendees/email,organizer/email,created,updated'
+)
+_EVENT_LIST_FIELDS = f'items({_EVENT_FIELDS}),nextPageToken'
+
+# Matches Google Meet links embedded in event descriptions or locations
+_MEET_LINK_RE = re.compile(r'https://meet\.google\.com/[a-z0-9-]+')
+
+# Number of description characters searched for a Meet link
+_MAX_DESCRIPTION_SCAN = 4096
+
+def _current_minute() -> int:
+    """Current time as a whole number of minutes since the epoch"""
+    return int(time.time() // 60)
+
+@functools.lru_cache(maxsize=4)
+def _time_range(months_back: int, minute: int) -> Tuple[str, str]:
+    """
+    Compute the API time window for meeting listings
+    Args:
+        months_back: Number of months to look back
+        minute: Minute bucket from _current_minute, so the range is stable within a minute
+    Returns:
+        Tuple of (time_min, time_max) RFC 3339 strings in UTC
+    """
+    now = datetime.fromtimestamp(minute * 60, tz=timezone.utc)
+    time_min = now - timedelta(days=months_back * 30)
+    time_max = now + timedelta(days=30)  # Include some future meetings
+    return (
+        time_min.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        time_max.strftime('%Y-%m-%dT%H:%M:%SZ')
+    )
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an RFC 3339 timestamp or date, accepting a trailing 'Z' for UTC"""
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(value)
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+def _parse_event_time(time_data: Optional[Dict[str, str]]) -> Optional[datetime]:
+    """Parse an event start/end object holding either a dateTime or an all-day date"""
+    if not time_data:
+        return None
+    date_time = time_data.get('dateTime')
+    if date_time:
+        return parse_timestamp(date_time)
+    date = time_data.get('date')
+    if date:
+        return parse_timestamp(date)
+    return None
+
 class GoogleCalendarIntegration:
     """Handles Google Calendar operations"""
     
     def __init__(self, calendar_service: Resource):
         self.calendar_service = calendar_service
+        # Calendar state changes slowly, so listings are cached for a few minutes
+        self._meetings_cache = TTLCache(maxsize=32, ttl=300)
+        self._event_cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_lock = threading.RLock()
+        # Fetches the next result page while the current one is being parsed
+        self._page_executor = ThreadPoolExecutor(max_workers=4)
+    
+    def invalidate_cache(self):
+        """Drop cached meeting listings and event lookups"""
+        with self._cache_lock:
+            self._meetings_cache.clear()
+            self._event_cache.clear()
     
-    def get_upcoming_meetings(self, months_back: int = 3) -> List[Dict[str, Any]]:
+    def get_upcoming_meetings(self, months_back: int = 3, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch upcoming meetings from the past N months
         Args:
             months_back: Number of months to look back (default: 3)
+            refresh: Skip the cached listing for callers that manage their own cache lifetime
         Returns:
             List of meeting dictionaries sorted by start time (latest first)
         """
+        cache_key = ('primary', months_back)
+        if not refresh:
+            with self._cache_lock:
+                cached = self._meetings_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
             # Calculate time range
-            now = datetime.utcnow()
-            time_min = now - timedelta(days=months_back * 30)
-            time_max = now + timedelta(days=30)  # Include some future meetings
-            
-            # Format times for API
-            time_min_str = time_min.isoformat() + 'Z'
-            time_max_str = time_max.isoformat() + 'Z'
+            time_min_str, time_max_str = _time_range(months_back, _current_minute())
             
             # Fetch events from primary calendar
-            events_result = self.calendar_service.events().list(
-                calendarId='primary',
+            events = self._list_events(
                 timeMin=time_min_str,
-                timeMax=time_max_str,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+                timeMax=time_max_str
+            )
             
             # Process and filter events
             meetings = []
@@ -50,7 +128,12 @@ class GoogleCalendarIntegration:
                     meetings.append(meeting_info)
             
             # Sort by start time (latest first)
-            meetings.sort(key=lambda x: x['start_time'], reverse=True)
+            meetings.sort(key=itemgetter('start_time'), reverse=True)
+            
+            with self._cache_lock:
+                self._meetings_cache[cache_key] = meetings
+                for meeting in meetings:
+                    self._event_cache[meeting['id']] = meeting
             
             return meetings
             
@@ -58,6 +141,40 @@ class GoogleCalendarIntegration:
             print(f"Error fetching calendar events: {e}")
             return []
     
+    def _list_events(self, **params: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Yield events from every result page of the primary calendar
+        The next page is requested in the background while the caller processes the current one
+        Args:
+            params: Extra query parameters for events().list
+        Returns:
+            Iterator over raw calendar event dictionaries
+        """
+        events_result = self._fetch_events_page(params)
+        while True:
+            page_token = events_result.get('nextPageToken')
+            next_page = None
+            if page_token:
+                next_page = self._page_executor.submit(self._fetch_events_page, params, page_token)
+            
+            yield from events_result.get('items', [])
+            
+            if next_page is None:
+                return
+            events_result = next_page.result()
+    
+    def _fetch_events_page(self, params: Dict[str, Any], page_token: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch a single page of events from the primary calendar"""
+        if page_token:
+            params = dict(params, pageToken=page_token)
+        return self.calendar_service.events().list(
+            calendarId='primary',
+            singleEvents=True,
+            orderBy='startTime',
+            fields=_EVENT_LIST_FIELDS,
+            **params
+        ).execute()
+    
     def _extract_meeting_info(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Extract relevant meeting information from calendar event
@@ -69,63 +186,40 @@ class GoogleCalendarIntegration:
         try:
             # Check if event has Google Meet link
             meet_link = None
-            if 'conferenceData' in event:
-                conference_data = event['conferenceData']
-                if 'entryPoints' in conference_data:
-                    for entry_point in conference_data['entryPoints']:
-                        if entry_point.get('entryPointType') == 'video':
-                            meet_link = entry_point.get('uri')
-                            break
-            
-            # Also check for meet links in description or location
-            if not meet_link:
-                description = event.get('description', '')
-                location = event.get('location', '')
-                
-                # Look for meet.google.com links
-                import re
-                meet_pattern = r'https://meet\.google\.com/[a-z0-9-]+'
-                
-                for text in [description, location]:
-                    match = re.search(meet_pattern, text)
-                    if match:
-                        meet_link = match.group()
+            conference_data = event.get('conferenceData')
+            if conference_data:
+                for entry_point in conference_data.get('entryPoints', ()):
+                    if entry_point.get('entryPointType') == 'video':
+                        meet_link = entry_point.get('uri')
                         break
             
+            # Only scan description and location text when there is no conference link
             if not meet_link:
-                return None
+                # Cap the description so long agendas don't dominate the scan
+                match = _MEET_LINK_RE.search(event.get('description', '')[:_MAX_DESCRIPTION_SCAN])
+                if not match:
+                    match = _MEET_LINK_RE.search(event.get('location', ''))
+                if not match:
+                    return None
+                meet_link = match.group()
             
-            # Extract start and end times
-            start_time = None
-            end_time = None
+            # Events without a start time can't be ordered alongside the others
+            start_time = _parse_event_time(event.get('start'))
+            if start_time is None:
+                return None
             
-            if 'start' in event:
-                start_data = event['start']
-                if 'dateTime' in start_data:
-                    start_time = datetime.fromisoformat(
-                        start_data['dateTime'].replace('Z', '+00:00')
-                    )
-                elif 'date' in start_data:
-                    start_time = datetime.fromisoformat(start_data['date'])
-            
-            if 'end' in event:
-                end_data = event['end']
-                if 'dateTime' in end_data:
-                    end_time = datetime.fromisoformat(
-                        end_data['dateTime'].replace('Z', '+00:00')
-                    )
-                elif 'date' in end_data:
-                    end_time = datetime.fromisoformat(end_data['date'])
+            organizer = event.get('organizer')
+            attendees = event.get('attendees') or ()
             
             return {
                 'id': event.get('id'),
                 'title': event.get('summary', 'No Title'),
                 'description': event.get('description', ''),
                 'start_time': start_time,
-                'end_time': end_time,
+                'end_time': _parse_event_time(event.get('end')),
                 'meet_link': meet_link,
-                'attendees': self._extract_attendees(event.get('attendees', [])),
-                'organizer': event.get('organizer', {}).get('email', ''),
+                'attendees': [attendee['email'] for attendee in attendees if attendee.get('email')],
+                'organizer': organizer['email'] if organizer and 'email' in organizer else '',
                 'created': event.get('created'),
                 'updated': event.get('updated')
             }
@@ -134,10 +228,6 @@ class GoogleCalendarIntegration:
             print(f"Error extracting meeting info: {e}")
             return None
     
-    def _extract_attendees(self, attendees: List[Dict[str, Any]]) -> List[str]:
-        """Extract attendee emails from event attendees"""
-        return [attendee.get('email', '') for attendee in attendees if attendee.get('email')]
-    
     def get_meeting_by_id(self, meeting_id: str) -> Optional[Dict[str, Any]]:
         """
         Get specific meeting details by ID
@@ -146,18 +236,78 @@ class GoogleCalendarIntegration:
         Returns:
             Meeting info dictionary or None if not found
         """
+        with self._cache_lock:
+            cached = self._event_cache.get(meeting_id)
+        if cached is not None:
+            return cached
+        
         try:
             event = self.calendar_service.events().get(
                 calendarId='primary',
-                eventId=meeting_id
+                eventId=meeting_id,
+                fields=_EVENT_FIELDS
             ).execute()
             
-            return self._extract_meeting_info(event)
+            meeting = self._extract_meeting_info(event)
+            if meeting:
+                with self._cache_lock:
+                    self._event_cache[meeting_id] = meeting
+            return meeting
             
         except Exception as e:
             print(f"Error fetching meeting by ID: {e}")
             return None
     
+    def get_meetings_by_ids(self, meeting_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get details for several meetings using batched API requests
+        Args:
+            meeting_ids: Calendar event IDs
+        Returns:
+            List of meeting info dictionaries in the order requested (missing IDs are skipped)
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        with self._cache_lock:
+            for meeting_id in meeting_ids:
+                cached = self._event_cache.get(meeting_id)
+                if cached is not None:
+                    found[meeting_id] = cached
+                elif meeting_id not in missing:
+                    missing.append(meeting_id)
+        
+        def handle_event(request_id, response, exception):
+            if exception is not None:
+                print(f"Error fetching meeting {request_id}: {exception}")
+                return
+            meeting = self._extract_meeting_info(response)
+            if meeting:
+                found[request_id] = meeting
+        
+        try:
+            # The batch endpoint accepts at most 100 calls per HTTP request
+            for i in range(0, len(missing), 100):
+                batch = self.calendar_service.new_batch_http_request(callback=handle_event)
+                for meeting_id in missing[i:i + 100]:
+                    batch.add(
+                        self.calendar_service.events().get(
+                            calendarId='primary',
+                            eventId=meeting_id,
+                            fields=_EVENT_FIELDS
+                        ),
+                        request_id=meeting_id
+                    )
+                batch.execute()
+        except Exception as e:
+            print(f"Error fetching meetings by ID: {e}")
+        
+        with self._cache_lock:
+            for meeting_id in missing:
+                if meeting_id in found:
+                    self._event_cache[meeting_id] = found[meeting_id]
+        
+        return [found[meeting_id] for meeting_id in meeting_ids if meeting_id in found]
+    
     def search_meetings_by_title(self, title_query: str, months_back: int = 3) -> List[Dict[str, Any]]:
         """
         Search for meetings by title
@@ -169,24 +319,14 @@ class GoogleCalendarIntegration:
         """
         try:
             # Calculate time range
-            now = datetime.utcnow()
-            time_min = now - timedelta(days=months_back * 30)
-            time_max = now + timedelta(days=30)
-            
-            time_min_str = time_min.isoformat() + 'Z'
-            time_max_str = time_max.isoformat() + 'Z'
+            time_min_str, time_max_str = _time_range(months_back, _current_minute())
             
             # Search for events with title query and meet links
-            events_result = self.calendar_service.events().list(
-                calendarId='primary',
+            events = self._list_events(
                 timeMin=time_min_str,
                 timeMax=time_max_str,
-                singleEvents=True,
-                orderBy='startTime',
                 q=f'{title_query} meet.google.com'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            )
             
             meetings = []
             for event in events:
@@ -194,7 +334,7 @@ class GoogleCalendarIntegration:
                 if meeting_info:
                     meetings.append(meeting_info)
             
-            meetings.sort(key=lambda x: x['start_time'], reverse=True)
+            meetings.sort(key=itemgetter('start_time'), reverse=True)
             return meetings
             
         except Exception as e:
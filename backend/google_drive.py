@@ -3,22 +3,178 @@ Google Drive Integration Module
 Handles fetching meeting transcripts from Google Drive
 """
 
+import io
+import logging
 import os
 import re
-from typing import List, Dict, Any, Optional
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, IO
+from dataclasses import dataclass
 from datetime import datetime
+from cachetools import LRUCache
+import orjson
 from googleapiclient.discovery import Resource
 from googleapiclient.http import MediaIoBaseDownload
-import io
+
+from drive_index import DriveFileIndex
+
+logger = logging.getLogger(__name__)
+
+# Filename format: [Meeting name] ([Date and time of meeting])
+_TRANSCRIPT_SPLIT_RE = re.compile(r'^(.+?)\s*\((.+?)\)$')
+# The same format as a whole transcript name, one name per line, for parsing a page of names in one pass
+_TRANSCRIPT_NAME_LINE_RE = re.compile(r'^([^\n]+?)\s*\(([^\n]+?)\) - [Tt]ranscript$', re.MULTILINE)
+# Meeting code in a lowercased filename: the standard xxx-xxxx-xxx format anywhere
+# takes precedence over the general pattern, as each alternative scans the whole name
+_MEET_CODE_RE = re.compile(r'^(?:.*?([a-z0-9]{3}-[a-z0-9]{4}-[a-z0-9]{3})|.*?([a-z0-9-]{10,}))', re.DOTALL)
+# Lowercase substrings that mark a file name as a transcript
+_TRANSCRIPT_MARKERS = ('transcript',)
+# A standard xxx-xxxx-xxx meeting code on its own
+_STANDARD_CODE_RE = re.compile(r'[a-z0-9]{3}-[a-z0-9]{4}-[a-z0-9]{3}')
+# Characters stripped from meeting titles before using them in Drive queries
+_CLEAN_TITLE_RE = re.compile(r'[^\w\s]')
+
+# Partial responses: only the fields read by _extract_transcript_info, and a folder's id and name
+TRANSCRIPT_LIST_FIELDS = "nextPageToken, files(id, name, mimeType, size, createdTime, modifiedTime, webViewLink)"
+FOLDER_LIST_FIELDS = "files(id, name)"
+GOOGLE_DOC_MIME = 'application/vnd.google-apps.document'
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Retries with exponential backoff for rate-limited (429) and 5xx download requests
+DOWNLOAD_RETRIES = 3
+# Bytes requested per download chunk; each chunk is held in memory before it is written
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Largest page size files().list accepts; the default is 100
+LIST_PAGE_SIZE = 1000
+
+# Folder lookups are persisted here, one file per signed-in account, so later runs skip the folder search
+FOLDER_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'gmeet', 'folders-{account}.json')
+FOLDER_CACHE_TTL = 24 * 60 * 60  # Based on the file's mtime
+# Folder cache key for the transcript folder, which may be found under an alternative name;
+# exact-name lookups are keyed by 'name:<folder name>'
+_RECORDINGS_FOLDER_KEY = 'recordings'
+
+# Other names the Meet recordings folder may have, tried after 'Meet Recordings'
+FOLDER_ALTERNATIVE_NAMES = (
+    "Meet recordings",
+    "Google Meet Recordings",
+    "Meeting Recordings",
+    "Recordings"
+)
+
+@dataclass(slots=True)
+class TranscriptInfo:
+    """Transcript file details extracted from a Drive listing"""
+    
+    file_id: str
+    name: str
+    mime_type: str
+    size: int
+    created_time: Optional[str]
+    modified_time: Optional[str]
+    web_view_link: Optional[str]
+    meeting_code: Optional[str]
+    meeting_title: Optional[str]
+    meeting_date: Optional[str]
+    is_transcript: bool = True
+    
+    # Dictionary-style access for callers written against the former dict records
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
 
 class GoogleDriveIntegration:
     """Handles Google Drive operations for meeting transcripts"""
     
-    def __init__(self, drive_service: Resource):
+    def __init__(self, drive_service: Resource, account_key: str = ''):
         self.drive_service = drive_service
+        # Cached folder IDs belong to one account, so each account has its own cache file
+        self._folder_cache_path = FOLDER_CACHE_PATH.format(account=account_key or 'default')
         self.transcript_folder_name = "Meet Recordings"
+        # Transcripts don't change once generated, so extracted text is kept per file ID
+        self._content_cache = LRUCache(maxsize=256)
+        # Name and MIME type per file ID, filled from listings so downloads skip a files().get
+        self._meta_cache = LRUCache(maxsize=1024)
+        # Download directories already created, so repeat downloads skip makedirs
+        self._created_dirs: set[str] = set()
+        # Content extractors for MIME types recognized by exact match
+        self._content_handlers: Dict[str, Callable[[str, Dict[str, Any]], Optional[str]]] = {
+            GOOGLE_DOC_MIME: self._export_doc_text,
+            DOCX_MIME: self._extract_docx_text
+        }
+        self._cache_lock = threading.Lock()
+        # Folder info keyed by lookup; folders are rarely moved or renamed
+        self._folder_cache: Dict[str, Dict[str, Any]] = self._load_folder_cache()
+        # Local copy of folder listings so repeat searches only fetch Drive changes
+        try:
+            self._file_index: Optional[DriveFileIndex] = DriveFileIndex(drive_service, account_key)
+        except Exception as e:
+            logger.error("Error opening local Drive index: %s", e)
+            self._file_index = None
+    
+    def clear_cache(self):
+        """Drop cached transcript content and folder lookups"""
+        with self._cache_lock:
+            self._content_cache.clear()
+            self._meta_cache.clear()
+            if self._file_index is not None:
+                self._file_index.clear()
+            self._folder_cache.clear()
+            try:
+                os.remove(self._folder_cache_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error("Error removing folder cache: %s", e)
+    
+    def _load_folder_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load persisted folder lookups unless the cache file has expired"""
+        try:
+            if time.time() - os.path.getmtime(self._folder_cache_path) < FOLDER_CACHE_TTL:
+                with open(self._folder_cache_path, 'rb') as f:
+                    return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Error loading folder cache: %s", e)
+        return {}
+    
+    def _get_cached_folder(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a previously found folder by its lookup key"""
+        with self._cache_lock:
+            return self._folder_cache.get(key)
     
-    def search_meeting_transcripts(self, meeting_code: str = None, meeting_title: str = None, meeting_date: datetime = None) -> List[Dict[str, Any]]:
+    def _cache_folder(self, key: str, folder: Dict[str, Any]):
+        """Remember a found folder and persist the lookups via a temp file and atomic rename"""
+        with self._cache_lock:
+            self._folder_cache[key] = folder
+            data = orjson.dumps(self._folder_cache)
+            
+            try:
+                cache_dir = os.path.dirname(self._folder_cache_path)
+                os.makedirs(cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_path, self._folder_cache_path)
+                except Exception:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            except Exception as e:
+                logger.error("Error saving folder cache: %s", e)
+    
+    def search_meeting_transcripts(self, meeting_code: str = None, meeting_title: str = None, meeting_date: datetime = None) -> List[TranscriptInfo]:
         """
         Search for meeting transcripts in Google Drive
         Args:
@@ -32,142 +188,284 @@ class GoogleDriveIntegration:
             # First, try to find the "Meet Recordings" folder
             meet_recordings_folder = self._find_meet_recordings_folder()
             if not meet_recordings_folder:
-                print("'Meet Recordings' folder not found in Google Drive")
+                logger.warning("'Meet Recordings' folder not found in Google Drive")
                 return []
             
             folder_id = meet_recordings_folder['id']
-            print(f"Found 'Meet Recordings' folder: {meet_recordings_folder['name']}")
+            logger.debug("Found 'Meet Recordings' folder: %s", meet_recordings_folder['name'])
             
             # Search for files in the Meet Recordings folder
-            query_parts = [f"'{folder_id}' in parents"]
+            name_terms = []
             
             # Add meeting-specific search terms
             if meeting_title:
                 # Clean title for search (remove special characters)
-                clean_title = re.sub(r'[^\w\s]', '', meeting_title)
-                query_parts.append(f"name contains '{clean_title}'")
+                clean_title = _CLEAN_TITLE_RE.sub('', meeting_title)
+                name_terms.append(clean_title)
             
             # Search for transcript files with specific naming pattern
-            transcript_query = "name contains 'Transcript'"
-            query_parts.append(transcript_query)
+            name_terms.append('Transcript')
             
             # Note: We don't search for meeting code in filename as Google Meet 
             # transcript files don't include meeting codes in their names
             
-            full_query = " and ".join(query_parts)
-            print(f"Search query: {full_query}")
-            
-            # Execute search
-            results = self.drive_service.files().list(
-                q=full_query,
-                fields="files(id, name, mimeType, size, createdTime, modifiedTime, parents, webViewLink)"
-            ).execute()
-            
-            files = results.get('files', [])
-            print(f"Found {len(files)} files matching search criteria")
-            
-            # Process and filter files
             transcript_files = []
-            for file in files:
-                transcript_info = self._extract_transcript_info(file)
-                if transcript_info:
+            indexed_files = None
+            if self._file_index is not None:
+                try:
+                    indexed_files = self._file_index.search(folder_id, name_terms)
+                except Exception as e:
+                    logger.error("Error searching local Drive index, querying Drive instead: %s", e)
+            
+            if indexed_files is not None:
+                logger.debug("Searched local Drive index for: %s", ', '.join(name_terms))
+                # The index search required 'Transcript' in every name
+                for transcript_info in self._extract_page(indexed_files, trusted=True):
                     transcript_files.append(transcript_info)
-                    print(f"Valid transcript: {transcript_info['name']}")
+                    logger.debug("Valid transcript: %s", transcript_info['name'])
+            else:
+                query_parts = [f"'{folder_id}' in parents"]
+                query_parts.extend(f"name contains '{term}'" for term in name_terms)
+                full_query = " and ".join(query_parts)
+                logger.debug("Search query: %s", full_query)
+                
+                # Execute search, processing and filtering files page by page
+                for transcript_info in self._iter_transcripts(full_query, trusted=True):
+                    transcript_files.append(transcript_info)
+                    logger.debug("Valid transcript: %s", transcript_info['name'])
             
+            logger.debug("Found %d transcripts matching search criteria", len(transcript_files))
             return transcript_files
             
         except Exception as e:
-            print(f"Error searching for transcripts: {e}")
+            logger.error("Error searching for transcripts: %s", e)
             return []
     
+    def search_transcripts_for_meetings(self, meeting_titles: List[str]) -> Dict[str, List[TranscriptInfo]]:
+        """
+        Search for transcripts of several meetings with one index lookup, or one Drive query per group of titles
+        Args:
+            meeting_titles: Meeting titles to search for
+        Returns:
+            Dictionary mapping each meeting title to its transcript files
+        """
+        results: Dict[str, List[TranscriptInfo]] = {title: [] for title in meeting_titles}
+        
+        try:
+            meet_recordings_folder = self._find_meet_recordings_folder()
+            if not meet_recordings_folder:
+                logger.warning("'Meet Recordings' folder not found in Google Drive")
+                return results
+            
+            folder_id = meet_recordings_folder['id']
+            
+            # Clean titles for search the same way search_meeting_transcripts does
+            clean_titles = {}
+            for title in meeting_titles:
+                clean_title = _CLEAN_TITLE_RE.sub('', title or '').strip()
+                if clean_title:
+                    clean_titles[title] = clean_title
+            
+            # Answer from the local Drive index when available, like search_meeting_transcripts:
+            # one lookup of every transcript in the folder, matched to titles below
+            indexed_files = None
+            if self._file_index is not None:
+                try:
+                    indexed_files = self._file_index.search(folder_id, ['Transcript'])
+                except Exception as e:
+                    logger.error("Error searching local Drive index, querying Drive instead: %s", e)
+            
+            if indexed_files is not None:
+                meetings = [(title, clean_title.casefold()) for title, clean_title in clean_titles.items()]
+                for transcript_info in self._extract_page(indexed_files, trusted=True):
+                    self._match_transcript_to_meetings(transcript_info, meetings, results)
+                return results
+            
+            unique_titles = list(dict.fromkeys(clean_titles.values()))
+            
+            # Keep each query string to a reasonable length
+            for i in range(0, len(unique_titles), 20):
+                group = unique_titles[i:i + 20]
+                title_clauses = " or ".join(
+                    f"name contains '{clean_title}'" for clean_title in group
+                )
+                full_query = f"'{folder_id}' in parents and ({title_clauses}) and name contains 'Transcript'"
+                
+                # Only this group's meetings are matched, so a file returned by
+                # several groups' queries is attributed to each meeting once
+                group_titles = set(group)
+                group_meetings = [
+                    (title, clean_title.casefold()) for title, clean_title in clean_titles.items()
+                    if clean_title in group_titles
+                ]
+                
+                for transcript_info in self._iter_transcripts(full_query, trusted=True):
+                    self._match_transcript_to_meetings(transcript_info, group_meetings, results)
+            
+            return results
+            
+        except Exception as e:
+            logger.error("Error searching for transcripts: %s", e)
+            return results
+    
+    def _match_transcript_to_meetings(self, transcript_info: TranscriptInfo, meetings: List[Tuple[str, str]], results: Dict[str, List[TranscriptInfo]]):
+        """
+        Add a transcript to every meeting whose cleaned title its name contains
+        Args:
+            transcript_info: Transcript to attribute
+            meetings: (meeting title, case-folded cleaned title) pairs
+            results: Transcripts per meeting title, updated in place
+        """
+        # File names keep their punctuation, so clean them the same way as the titles
+        file_name = _CLEAN_TITLE_RE.sub('', transcript_info['name']).casefold()
+        for title, clean_title in meetings:
+            if clean_title in file_name:
+                results[title].append(transcript_info)
+    
+    def _iter_transcripts(self, query: str, trusted: bool = False) -> Iterator[TranscriptInfo]:
+        """
+        Yield transcript info for files matching a query, following every result page
+        Args:
+            query: Drive files().list query
+            trusted: Whether the query already restricts results to transcript names
+        Returns:
+            Iterator over transcript info records; callers may stop early
+        """
+        files = self.drive_service.files()
+        request = files.list(q=query, fields=TRANSCRIPT_LIST_FIELDS, pageSize=LIST_PAGE_SIZE)
+        while request is not None:
+            response = request.execute()
+            yield from self._extract_page(response.get('files', []), trusted)
+            request = files.list_next(request, response)
+    
+    def _extract_page(self, files: List[Dict[str, Any]], trusted: bool = False) -> Iterator[TranscriptInfo]:
+        """
+        Yield transcript info for a page of Drive files, parsing all their names in one regex pass
+        Args:
+            files: Drive file dictionaries
+            trusted: Whether the files are already known to be transcripts
+        Returns:
+            Iterator over transcript info records
+        """
+        names = [file.get('name') or '' for file in files]
+        parsed_names = self._parse_transcript_filenames(names)
+        extract = self._extract_transcript_info_trusted if trusted else self._extract_transcript_info
+        for file, parsed_name in zip(files, parsed_names):
+            transcript_info = extract(file, parsed_name)
+            if transcript_info:
+                self._remember_metadata(file)
+                yield transcript_info
+    
     def _find_meet_recordings_folder(self) -> Optional[Dict[str, Any]]:
         """
         Find the 'Meet Recordings' folder in Google Drive
         Returns:
             Folder info dictionary or None if not found
         """
+        cached = self._get_cached_folder(_RECORDINGS_FOLDER_KEY)
+        if cached:
+            return cached
+        
+        # Folder names to try, in order of preference; the first is matched exactly
+        folder_queries = [("Meet Recordings", "name = 'Meet Recordings'")] + [
+            (alt_name, f"name contains '{alt_name}'")
+            for alt_name in FOLDER_ALTERNATIVE_NAMES
+        ]
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("Error searching for folder '%s': %s", request_id, exception)
+            else:
+                found[request_id] = response.get('files', [])
+        
         try:
-            # Search for the Meet Recordings folder
-            query = "name = 'Meet Recordings' and mimeType = 'application/vnd.google-apps.folder'"
-            
-            results = self.drive_service.files().list(
-                q=query,
-                fields="files(id, name, mimeType, parents)"
-            ).execute()
+            # Send every candidate query in a single batch request
+            batch = self.drive_service.new_batch_http_request(callback=on_response)
+            for name, name_clause in folder_queries:
+                batch.add(
+                    self.drive_service.files().list(
+                        q=f"{name_clause} and mimeType = 'application/vnd.google-apps.folder'",
+                        fields=FOLDER_LIST_FIELDS
+                    ),
+                    request_id=name
+                )
+            batch.execute()
             
-            folders = results.get('files', [])
+            for name, _ in folder_queries:
+                folders = found.get(name)
+                if folders:
+                    if name != "Meet Recordings":
+                        logger.debug("Found folder with alternative name: %s", folders[0]['name'])
+                    self._cache_folder(_RECORDINGS_FOLDER_KEY, folders[0])
+                    return folders[0]  # Return the first match
             
-            if folders:
-                return folders[0]  # Return the first match
-            else:
-                # Try alternative names
-                alternative_names = [
-                    "Meet recordings",
-                    "Google Meet Recordings", 
-                    "Meeting Recordings",
-                    "Recordings"
-                ]
-                
-                for alt_name in alternative_names:
-                    query = f"name contains '{alt_name}' and mimeType = 'application/vnd.google-apps.folder'"
-                    results = self.drive_service.files().list(q=query).execute()
-                    folders = results.get('files', [])
-                    if folders:
-                        print(f"Found folder with alternative name: {folders[0]['name']}")
-                        return folders[0]
-                
-                return None
+            return None
                 
         except Exception as e:
-            print(f"Error finding Meet Recordings folder: {e}")
+            logger.error("Error finding Meet Recordings folder: %s", e)
             return None
     
-    def _extract_transcript_info(self, file: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _extract_transcript_info(self, file: Dict[str, Any], parsed_name: Optional[Tuple[Optional[str], Optional[str]]] = None) -> Optional['TranscriptInfo']:
         """
         Extract relevant information from transcript file
         Args:
             file: Google Drive file dictionary
+            parsed_name: Meeting title and date already parsed from the file name
         Returns:
-            Transcript info dictionary or None if not a valid transcript
+            Transcript info or None if not a valid transcript
+        """
+        name = (file.get('name') or '').lower()
+        mime_type = file.get('mimeType') or ''
+        
+        # Check if it's a transcript file based on the naming convention
+        # Format: [Meeting name] ([Date and time of meeting]) - Transcript
+        # A ' - transcript' suffix already contains a marker, so one substring test covers it
+        is_transcript = (
+            any(marker in name for marker in _TRANSCRIPT_MARKERS) or
+            'transcript' in mime_type  # Drive MIME types are already lowercase
+        )
+        
+        if not is_transcript:
+            return None
+        
+        return self._extract_transcript_info_trusted(file, parsed_name)
+    
+    def _extract_transcript_info_trusted(self, file: Dict[str, Any], parsed_name: Optional[Tuple[Optional[str], Optional[str]]] = None) -> Optional['TranscriptInfo']:
+        """
+        Extract relevant information from a file already known to be a transcript,
+        such as one returned by a query requiring 'Transcript' in the name
+        Args:
+            file: Google Drive file dictionary
+            parsed_name: Meeting title and date already parsed from the file name
+        Returns:
+            Transcript info or None if extraction fails
         """
         try:
-            name = file.get('name', '').lower()
+            filename = file.get('name', '')
             mime_type = file.get('mimeType', '')
             
-            # Check if it's a transcript file based on the naming convention
-            # Format: [Meeting name] ([Date and time of meeting]) - Transcript
-            is_transcript = (
-                'transcript' in name or
-                name.endswith(' - transcript') or
-                name.endswith(' - Transcript') or
-                'transcript' in mime_type.lower()
-            )
-            
-            if not is_transcript:
-                return None
-            
             # Extract meeting code from filename if possible
-            meeting_code = self._extract_meeting_code_from_filename(file.get('name', ''))
+            meeting_code = self._extract_meeting_code_from_filename(filename)
             
             # Extract meeting title and date from filename
-            meeting_title, meeting_date = self._parse_transcript_filename(file.get('name', ''))
-            
-            return {
-                'file_id': file.get('id'),
-                'name': file.get('name'),
-                'mime_type': mime_type,
-                'size': file.get('size'),
-                'created_time': file.get('createdTime'),
-                'modified_time': file.get('modifiedTime'),
-                'web_view_link': file.get('webViewLink'),
-                'meeting_code': meeting_code,
-                'meeting_title': meeting_title,
-                'meeting_date': meeting_date,
-                'is_transcript': True
-            }
+            meeting_title, meeting_date = parsed_name or self._parse_transcript_filename(filename)
+            
+            return TranscriptInfo(
+                file_id=file.get('id'),
+                name=file.get('name'),
+                mime_type=mime_type,
+                size=int(file.get('size') or 0),  # Drive reports sizes as strings; Google Docs have none
+                created_time=file.get('createdTime'),
+                modified_time=file.get('modifiedTime'),
+                web_view_link=file.get('webViewLink'),
+                meeting_code=meeting_code,
+                meeting_title=meeting_title,
+                meeting_date=meeting_date
+            )
             
         except Exception as e:
-            print(f"Error extracting transcript info: {e}")
+            logger.error("Error extracting transcript info: %s", e)
             return None
     
     def _parse_transcript_filename(self, filename: str) -> tuple[Optional[str], Optional[str]]:
@@ -182,14 +480,12 @@ class GoogleDriveIntegration:
         try:
             # Remove the " - Transcript" suffix
             if filename.endswith(' - Transcript'):
-                filename = filename[:-12]  # Remove " - Transcript"
+                filename = filename[:-13]  # Remove " - Transcript"
             elif filename.endswith(' - transcript'):
-                filename = filename[:-12]  # Remove " - transcript"
+                filename = filename[:-13]  # Remove " - transcript"
             
             # Look for pattern: Meeting name (Date and time)
-            import re
-            pattern = r'^(.+?)\s*\((.+?)\)$'
-            match = re.match(pattern, filename)
+            match = _TRANSCRIPT_SPLIT_RE.match(filename)
             
             if match:
                 meeting_title = match.group(1).strip()
@@ -200,9 +496,37 @@ class GoogleDriveIntegration:
                 return filename.strip(), None
                 
         except Exception as e:
-            print(f"Error parsing transcript filename: {e}")
+            logger.error("Error parsing transcript filename: %s", e)
             return None, None
     
+    def _parse_transcript_filenames(self, filenames: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Parse many transcript filenames at once
+        Names in the standard format are matched in a single regex pass over all of them;
+        any other name is parsed individually by _parse_transcript_filename
+        Args:
+            filenames: Names of the transcript files
+        Returns:
+            List of (meeting_title, meeting_date) tuples in the same order
+        """
+        blob = '\n'.join(filenames)
+        matches = {
+            match.start(): match
+            for match in _TRANSCRIPT_NAME_LINE_RE.finditer(blob)
+        }
+        
+        results = []
+        offset = 0
+        for filename in filenames:
+            match = matches.get(offset)
+            # A match must cover the whole name, which rules out names containing newlines
+            if match is not None and match.end() == offset + len(filename):
+                results.append((match.group(1).strip(), match.group(2).strip()))
+            else:
+                results.append(self._parse_transcript_filename(filename))
+            offset += len(filename) + 1
+        return results
+    
     def _extract_meeting_code_from_filename(self, filename: str) -> Optional[str]:
         """
         Extract meeting code from filename
@@ -211,183 +535,259 @@ class GoogleDriveIntegration:
         Returns:
             Meeting code if found, None otherwise
         """
-        # Look for patterns like meeting codes in filenames
-        patterns = [
-            r'([a-z0-9]{3}-[a-z0-9]{4}-[a-z0-9]{3})',  # Standard meet code format
-            r'([a-z0-9-]{10,})',  # General meet code pattern
-        ]
+        filename = filename.lower()
         
-        for pattern in patterns:
-            match = re.search(pattern, filename.lower())
-            if match:
-                return match.group(1)
+        # Fast path: a standard code at the very start is always the first match
+        if len(filename) >= 12 and filename[3] == '-' and filename[8] == '-':
+            candidate = filename[:12]
+            if _STANDARD_CODE_RE.fullmatch(candidate):
+                return candidate
+        
+        # Look for patterns like meeting codes in filenames
+        match = _MEET_CODE_RE.match(filename)
+        if match:
+            return match.group(1) or match.group(2)
         
         return None
     
-    def download_transcript(self, file_id: str, output_path: str = None) -> Optional[str]:
+    def download_many(self, file_ids: List[str], output_dir: str = 'transcripts', max_workers: int = 8) -> Dict[str, Optional[str]]:
+        """
+        Download several transcript files concurrently
+        Args:
+            file_ids: Google Drive file IDs
+            output_dir: Directory to save the files in, under their Drive names
+            max_workers: Maximum number of downloads in flight at once
+        Returns:
+            Dictionary mapping each file ID to its downloaded path, or None if it failed
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            paths = executor.map(
+                lambda file_id: self.download_transcript(file_id, output_dir=output_dir),
+                file_ids
+            )
+            return dict(zip(file_ids, paths))
+    
+    def _remember_metadata(self, file: Dict[str, Any]):
+        """Store the name and MIME type from a Drive file dictionary"""
+        with self._cache_lock:
+            self._meta_cache[file['id']] = {'name': file.get('name'), 'mimeType': file.get('mimeType')}
+    
+    def _get_file_metadata(self, file_id: str) -> Dict[str, Any]:
+        """
+        Get a file's name and MIME type, using metadata already seen in a listing when possible
+        Args:
+            file_id: Google Drive file ID
+        Returns:
+            Dictionary with 'name' and 'mimeType'
+        """
+        with self._cache_lock:
+            metadata = self._meta_cache.get(file_id)
+        if metadata is None:
+            metadata = self.drive_service.files().get(
+                fileId=file_id,
+                fields="id, name, mimeType"
+            ).execute(num_retries=DOWNLOAD_RETRIES)
+            self._remember_metadata(metadata)
+        return metadata
+    
+    def download_transcript(self, file_id: str, output_path: str = None, fileobj: Optional[IO[bytes]] = None, output_dir: str = 'transcripts', metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         Download transcript file from Google Drive
         Args:
             file_id: Google Drive file ID
             output_path: Local path to save the file
+            fileobj: Binary file-like object to write into instead of a local file
+            output_dir: Directory used when output_path is not given
+            metadata: File name and MIME type if already known
         Returns:
-            Path to downloaded file or None if failed
+            Path to downloaded file (the Drive file name when fileobj is given) or None if failed
         """
         try:
             # Get file metadata
-            file_metadata = self.drive_service.files().get(fileId=file_id).execute()
+            file_metadata = metadata or self._get_file_metadata(file_id)
             filename = file_metadata.get('name', 'transcript.txt')
             mime_type = file_metadata.get('mimeType', '')
             
-            print(f"File: {filename}")
-            print(f"MIME Type: {mime_type}")
-            
-            # Set output path if not provided
-            if not output_path:
-                output_path = f"transcripts/{filename}"
-            
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            logger.debug("File: %s", filename)
+            logger.debug("MIME Type: %s", mime_type)
             
-            # Handle different file types
-            if mime_type == 'application/vnd.google-apps.document':
-                # Google Docs - export as DOCX
-                print("Exporting Google Doc as DOCX...")
+            if fileobj is None:
+                # Set output path if not provided
+                if not output_path:
+                    output_path = os.path.join(output_dir, filename)
+                
+                # Create directory if it doesn't exist, once per directory
+                target_dir = os.path.dirname(output_path)
+                if target_dir not in self._created_dirs:
+                    os.makedirs(target_dir or '.', exist_ok=True)
+                    self._created_dirs.add(target_dir)
+            
+            # Google Docs are exported as DOCX; DOCX and other files are downloaded as is
+            if mime_type == GOOGLE_DOC_MIME:
+                logger.debug("Exporting Google Doc as DOCX...")
                 request = self.drive_service.files().export_media(
                     fileId=file_id,
-                    mimeType='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+                    mimeType=DOCX_MIME
                 )
-            elif filename.endswith('.docx') or 'docx' in mime_type:
-                # Already a DOCX file - download directly
-                print("Downloading DOCX file...")
-                request = self.drive_service.files().get_media(fileId=file_id)
             else:
-                # Other file types - download as is
-                print("Downloading file...")
+                logger.debug("Downloading file...")
                 request = self.drive_service.files().get_media(fileId=file_id)
             
-            # Download file
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
-            
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-            
-            # Save to file
-            with open(output_path, 'wb') as f:
-                f.write(fh.getvalue())
-            
-            print(f"Transcript downloaded to: {output_path}")
+            if fileobj is not None:
+                self._stream_download(request, fileobj)
+                return filename
+            
+            # Download into a temp file beside the target and rename it into place
+            # once complete, so a failed download leaves no partial file behind
+            tmp_path = f"{output_path}.part"
+            try:
+                with open(tmp_path, 'wb') as fh:
+                    self._stream_download(request, fh)
+                os.replace(tmp_path, output_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            
+            logger.info("Transcript downloaded to: %s", output_path)
             return output_path
             
         except Exception as e:
-            print(f"Error downloading transcript: {e}")
+            logger.error("Error downloading transcript: %s", e)
+            return None
+    
+    def _stream_download(self, request, fh: IO[bytes]):
+        """Download a media request chunk by chunk into fh without buffering the whole file in memory"""
+        downloader = MediaIoBaseDownload(fh, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+        
+        done = False
+        while done is False:
+            status, done = downloader.next_chunk(num_retries=DOWNLOAD_RETRIES)
+    
+    def _download_bytes(self, file_id: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[io.BytesIO]:
+        """
+        Download a file from Google Drive into memory
+        Args:
+            file_id: Google Drive file ID
+            metadata: File name and MIME type if already known
+        Returns:
+            Buffer positioned at the start of the file content or None if failed
+        """
+        buffer = io.BytesIO()
+        if self.download_transcript(file_id, fileobj=buffer, metadata=metadata) is None:
             return None
+        buffer.seek(0)
+        return buffer
     
-    def get_transcript_content(self, file_id: str) -> Optional[str]:
+    def get_transcript_content(self, file_id: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
-        Get transcript content as text
+        Get transcript content as text, serving repeat requests from cache
         Args:
             file_id: Google Drive file ID
+            metadata: File name and MIME type if already known
+        Returns:
+            Transcript content as string or None if failed
+        """
+        with self._cache_lock:
+            content = self._content_cache.get(file_id)
+        if content is not None:
+            return content
+        
+        content = self._fetch_transcript_content(file_id, metadata)
+        if content is not None:
+            with self._cache_lock:
+                self._content_cache[file_id] = content
+        return content
+    
+    def _fetch_transcript_content(self, file_id: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Download and extract transcript content from Google Drive
+        Args:
+            file_id: Google Drive file ID
+            metadata: File name and MIME type if already known
         Returns:
             Transcript content as string or None if failed
         """
         try:
             # Get file metadata
-            file_metadata = self.drive_service.files().get(fileId=file_id).execute()
+            file_metadata = metadata or self._get_file_metadata(file_id)
             mime_type = file_metadata.get('mimeType', '')
             filename = file_metadata.get('name', '')
             
-            print(f"Getting content from: {filename}")
-            print(f"MIME Type: {mime_type}")
+            logger.debug("Getting content from: %s", filename)
+            logger.debug("MIME Type: %s", mime_type)
             
-            # Handle Google Docs
-            if mime_type == 'application/vnd.google-apps.document':
-                print("Exporting Google Doc as plain text...")
-                request = self.drive_service.files().export_media(
-                    fileId=file_id,
-                    mimeType='text/plain'
-                )
-                content = request.execute()
-                return content.decode('utf-8')
-            
-            # Handle DOCX files
-            elif filename.endswith('.docx') or 'docx' in mime_type:
-                print("DOCX file detected - downloading for content extraction...")
-                # For DOCX files, we need to download and extract text
-                temp_path = self.download_transcript(file_id, f"transcripts/temp_{file_id}.docx")
-                if temp_path and os.path.exists(temp_path):
-                    try:
-                        # Try to read DOCX content using python-docx if available
-                        try:
-                            from docx import Document
-                            doc = Document(temp_path)
-                            content = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-                            return content
-                        except ImportError:
-                            print("python-docx not available, trying basic text extraction...")
-                            # Fallback: try to read as text (may not work well)
-                            with open(temp_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                            return content
-                    except Exception as e:
-                        print(f"Error extracting DOCX content: {e}")
-                        return None
-                    finally:
-                        # Always clean up temp file
-                        try:
-                            if os.path.exists(temp_path):
-                                os.remove(temp_path)
-                                print(f"Cleaned up temp file: {temp_path}")
-                        except Exception as cleanup_error:
-                            print(f"Warning: Could not clean up temp file: {cleanup_error}")
+            # Pick the extractor by exact MIME type, falling back to the file name
+            handler = self._content_handlers.get(mime_type)
+            if handler is None:
+                if filename.endswith('.docx'):
+                    handler = self._extract_docx_text
+                elif 'text' in mime_type or filename.endswith('.txt'):
+                    handler = self._get_text
                 else:
-                    print("Failed to download temp file for content extraction")
-                    return None
+                    handler = self._decode_download
             
-            # Handle text files
-            elif 'text' in mime_type or filename.endswith('.txt'):
-                print("Getting text content...")
-                request = self.drive_service.files().get_media(fileId=file_id)
-                content = request.execute()
-                return content.decode('utf-8')
-            
-            # For other file types, try to download and read
-            else:
-                print("Downloading file for content extraction...")
-                temp_path = self.download_transcript(file_id, f"transcripts/temp_{file_id}")
-                if temp_path and os.path.exists(temp_path):
-                    try:
-                        with open(temp_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        return content
-                    except UnicodeDecodeError:
-                        # Try different encodings
-                        for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-                            try:
-                                with open(temp_path, 'r', encoding=encoding) as f:
-                                    content = f.read()
-                                return content
-                            except:
-                                continue
-                        return None
-                    finally:
-                        # Always clean up temp file
-                        try:
-                            if os.path.exists(temp_path):
-                                os.remove(temp_path)
-                                print(f"Cleaned up temp file: {temp_path}")
-                        except Exception as cleanup_error:
-                            print(f"Warning: Could not clean up temp file: {cleanup_error}")
+            return handler(file_id, file_metadata)
             
+        except Exception as e:
+            logger.error("Error getting transcript content: %s", e)
             return None
-            
+    
+    def _export_doc_text(self, file_id: str, metadata: Dict[str, Any]) -> Optional[str]:
+        """Export a Google Doc as plain text"""
+        logger.debug("Exporting Google Doc as plain text...")
+        request = self.drive_service.files().export_media(
+            fileId=file_id,
+            mimeType='text/plain'
+        )
+        content = request.execute()
+        return content.decode('utf-8')
+    
+    def _extract_docx_text(self, file_id: str, metadata: Dict[str, Any]) -> Optional[str]:
+        """Download a DOCX file and extract its paragraph text"""
+        logger.debug("DOCX file detected - downloading for content extraction...")
+        buffer = self._download_bytes(file_id, metadata)
+        if buffer is None:
+            logger.warning("Failed to download file for content extraction")
+            return None
+        try:
+            # Try to read DOCX content using python-docx if available
+            try:
+                from docx import Document
+                doc = Document(buffer)
+                content = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+                return content
+            except ImportError:
+                logger.warning("python-docx not available, trying basic text extraction...")
+                # Fallback: try to read as text (may not work well)
+                return buffer.getvalue().decode('utf-8', errors='ignore')
         except Exception as e:
-            print(f"Error getting transcript content: {e}")
+            logger.error("Error extracting DOCX content: %s", e)
+            return None
+    
+    def _get_text(self, file_id: str, metadata: Dict[str, Any]) -> Optional[str]:
+        """Download a text file's content"""
+        logger.debug("Getting text content...")
+        request = self.drive_service.files().get_media(fileId=file_id)
+        content = request.execute()
+        return content.decode('utf-8')
+    
+    def _decode_download(self, file_id: str, metadata: Dict[str, Any]) -> Optional[str]:
+        """Download any other file and decode it with the first encoding that works"""
+        logger.debug("Downloading file for content extraction...")
+        buffer = self._download_bytes(file_id, metadata)
+        if buffer is None:
             return None
+        data = buffer.getvalue()
+        # Try different encodings
+        for encoding in ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']:
+            try:
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        return None
     
-    def search_transcripts_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+    def search_transcripts_by_date_range(self, start_date: datetime, end_date: datetime) -> List[TranscriptInfo]:
         """
         Search for transcripts within a date range
         Args:
@@ -403,26 +803,13 @@ class GoogleDriveIntegration:
             
             query = f"modifiedTime >= '{start_str}' and modifiedTime <= '{end_str}' and (name contains 'transcript' or name contains 'Transcript')"
             
-            results = self.drive_service.files().list(
-                q=query,
-                fields="files(id, name, mimeType, size, createdTime, modifiedTime, parents, webViewLink)"
-            ).execute()
-            
-            files = results.get('files', [])
-            
-            transcript_files = []
-            for file in files:
-                transcript_info = self._extract_transcript_info(file)
-                if transcript_info:
-                    transcript_files.append(transcript_info)
-            
-            return transcript_files
+            return list(self._iter_transcripts(query, trusted=True))
             
         except Exception as e:
-            print(f"Error searching transcripts by date: {e}")
+            logger.error("Error searching transcripts by date: %s", e)
             return []
     
-    def get_folder_contents(self, folder_name: str = "Meet Recordings") -> List[Dict[str, Any]]:
+    def get_folder_contents(self, folder_name: str = "Meet Recordings") -> List[TranscriptInfo]:
         """
         Get contents of a specific folder
         Args:
@@ -432,33 +819,28 @@ class GoogleDriveIntegration:
         """
         try:
             # First, find the folder
-            folder_query = f"name = '{folder_name}' and mimeType = 'application/vnd.google-apps.folder'"
-            folder_results = self.drive_service.files().list(q=folder_query).execute()
-            
-            folders = folder_results.get('files', [])
-            if not folders:
-                print(f"Folder '{folder_name}' not found")
-                return []
+            folder = self._get_cached_folder(f"name:{folder_name}")
+            if not folder:
+                folder_query = f"name = '{folder_name}' and mimeType = 'application/vnd.google-apps.folder'"
+                folder_results = self.drive_service.files().list(
+                    q=folder_query,
+                    fields=FOLDER_LIST_FIELDS
+                ).execute()
+                
+                folders = folder_results.get('files', [])
+                if not folders:
+                    logger.warning("Folder '%s' not found", folder_name)
+                    return []
+                
+                folder = folders[0]
+                self._cache_folder(f"name:{folder_name}", folder)
             
-            folder_id = folders[0]['id']
+            folder_id = folder['id']
             
             # Get files in the folder
             files_query = f"'{folder_id}' in parents"
-            files_results = self.drive_service.files().list(
-                q=files_query,
-                fields="files(id, name, mimeType, size, createdTime, modifiedTime, parents, webViewLink)"
-            ).execute()
-            
-            files = files_results.get('files', [])
-            
-            transcript_files = []
-            for file in files:
-                transcript_info = self._extract_transcript_info(file)
-                if transcript_info:
-                    transcript_files.append(transcript_info)
-            
-            return transcript_files
+            return list(self._iter_transcripts(files_query))
             
         except Exception as e:
-            print(f"Error getting folder contents: {e}")
+            logger.error("Error getting folder contents: %s", e)
             return []
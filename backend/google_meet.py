@@ -3,15 +3,47 @@ Google Meet Integration Module
 Handles Google Meet meeting details and URL parsing
 """
 
+import functools
+import logging
 import re
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Iterator, Optional
 from urllib.parse import urlparse, parse_qs
 
+logger = logging.getLogger(__name__)
+
+# Meeting codes are ASCII, so skip Unicode-aware matching
+_MEET_URL_RE = re.compile(r'https://meet\.google\.com/([a-z0-9-]+)', re.ASCII)
+
+# Hyperscan scans large transcript bodies much faster than re; it reports every
+# match end, so only the furthest end per start offset is kept
+try:
+    import hyperscan
+    _MEET_URL_DB = hyperscan.Database()
+    _MEET_URL_DB.compile(
+        expressions=[rb'https://meet\.google\.com/[a-z0-9-]+'],
+        ids=[0],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST]
+    )
+except ImportError:
+    hyperscan = None
+    _MEET_URL_DB = None
+# A database shares one scratch space, so scans must not run concurrently
+_MEET_URL_DB_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=256)
+def _extract_meeting_code(meet_url: str) -> Optional[str]:
+    """Extract the meeting code from a Meet URL; cached since the same calendar links are parsed on every listing and prefetch"""
+    match = _MEET_URL_RE.search(meet_url.strip())
+    return match.group(1) if match else None
+
 class GoogleMeetIntegration:
     """Handles Google Meet operations and URL parsing"""
     
+    _URL_PREFIX = "https://meet.google.com/"
+    
     def __init__(self):
-        self.meet_pattern = re.compile(r'https://meet\.google\.com/([a-z0-9-]+)')
+        self.meet_pattern = _MEET_URL_RE
     
     def parse_meet_url(self, meet_url: str) -> Optional[Dict[str, Any]]:
         """
@@ -45,7 +77,7 @@ class GoogleMeetIntegration:
             }
             
         except Exception as e:
-            print(f"Error parsing Meet URL: {e}")
+            logger.error("Error parsing Meet URL: %s", e)
             return None
     
     def validate_meet_url(self, meet_url: str) -> bool:
@@ -56,8 +88,8 @@ class GoogleMeetIntegration:
         Returns:
             True if valid, False otherwise
         """
-        parsed = self.parse_meet_url(meet_url)
-        return parsed is not None and parsed.get('is_valid', False)
+        # A URL parses successfully exactly when the pattern matches, so skip building the details
+        return self.meet_pattern.search(meet_url.strip()) is not None
     
     def extract_meeting_code_from_url(self, meet_url: str) -> Optional[str]:
         """
@@ -67,8 +99,10 @@ class GoogleMeetIntegration:
         Returns:
             Meeting code or None if not found
         """
-        parsed = self.parse_meet_url(meet_url)
-        return parsed.get('meeting_code') if parsed else None
+        # The cache lives at module level so it doesn't keep integration instances alive
+        if not isinstance(meet_url, str):
+            return None
+        return _extract_meeting_code(meet_url)
     
     def format_meet_url(self, meeting_code: str) -> str:
         """
@@ -78,7 +112,7 @@ class GoogleMeetIntegration:
         Returns:
             Formatted Google Meet URL
         """
-        return f"https://meet.google.com/{meeting_code}"
+        return self._URL_PREFIX + meeting_code
     
     def get_meeting_info_from_url(self, meet_url: str) -> Dict[str, Any]:
         """
@@ -112,8 +146,31 @@ class GoogleMeetIntegration:
         Returns:
             List of found Google Meet URLs
         """
-        matches = self.meet_pattern.findall(text)
-        return [self.format_meet_url(match) for match in matches]
+        if _MEET_URL_DB is None:
+            return list(self.iter_meet_urls_in_text(text))
+        
+        # Offsets are into the UTF-8 bytes, so slice those rather than the str
+        data = text.encode('utf-8')
+        ends: Dict[int, int] = {}
+        
+        def on_match(pattern_id, start, end, flags, context):
+            ends[start] = end
+        
+        with _MEET_URL_DB_LOCK:
+            _MEET_URL_DB.scan(data, match_event_handler=on_match)
+        return [data[start:end].decode('ascii') for start, end in ends.items()]
+    
+    def iter_meet_urls_in_text(self, text: str) -> Iterator[str]:
+        """
+        Lazily yield Google Meet URLs found in text content
+        Args:
+            text: Text content to search
+        Returns:
+            Iterator over found Google Meet URLs
+        """
+        prefix = self._URL_PREFIX
+        for match in self.meet_pattern.finditer(text):
+            yield prefix + match.group(1)
     
     def is_meet_url(self, url: str) -> bool:
         """
@@ -3,15 +3,80 @@ Main Script for Google Meet Transcript Downloader
 Handles user interaction and orchestrates the integration modules
 """
 
+import asyncio
 import os
+import re
 import sys
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from xml.etree import ElementTree
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Callable, Optional, Tuple, TYPE_CHECKING
+
+import diskcache
+import orjson
 
 from google_auth import GoogleAuthManager
-from google_calendar import GoogleCalendarIntegration
+from google_calendar import GoogleCalendarIntegration, parse_timestamp
 from google_meet import GoogleMeetIntegration
-from google_drive import GoogleDriveIntegration
+from google_drive import GoogleDriveIntegration, GOOGLE_DOC_MIME, DOCX_MIME
+
+if TYPE_CHECKING:
+    # aiohttp is imported lazily since it is only needed once a download starts
+    import aiohttp
+
+# Characters not allowed in filenames on common filesystems, and whitespace runs
+_INVALID_FS_CHARS = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE = re.compile(r'\s+')
+
+# Directory for cached Calendar and Drive listings
+CACHE_DIR = os.path.join('.cache', 'gmeet')
+CALENDAR_CACHE_TTL = 60
+TRANSCRIPT_CACHE_TTL = 300  # Transcripts appear minutes to hours after a meeting
+# Number of most recent meetings whose transcripts are searched for in the background
+PREFETCH_MEETINGS = 10
+# Number of meetings listed per page in the calendar workflow
+MEETINGS_PAGE_SIZE = 20
+
+# Number of characters shown in the transcript preview
+PREVIEW_CHARS = 500
+# Bytes requested for the plain-text preview; comfortably more than PREVIEW_CHARS
+PREVIEW_BYTES = 65536
+# WordprocessingML namespace used in word/document.xml
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Files above this size are downloaded as concurrent byte ranges
+CHUNKED_DOWNLOAD_MIN_SIZE = 2 << 20
+DOWNLOAD_CHUNKS = 4
+
+DRIVE_FILES_URL = 'https://www.googleapis.com/drive/v3/files'
+
+# Meeting fields holding datetimes, which come back from JSON as strings
+_DATETIME_FIELDS = ('start_time', 'end_time')
+
+class OrjsonDisk(diskcache.Disk):
+    """Disk cache serializer that stores meeting and transcript lists as JSON instead of pickles"""
+    
+    def store(self, value, read, key=diskcache.core.UNKNOWN):
+        if not read:
+            value = orjson.dumps(value)
+        return super().store(value, read, key=key)
+    
+    def fetch(self, mode, filename, value, read):
+        data = super().fetch(mode, filename, value, read)
+        # Entries pickled before this serializer was introduced load as-is
+        if read or not isinstance(data, bytes):
+            return data
+        
+        items = orjson.loads(data)
+        for item in items:
+            for field in _DATETIME_FIELDS:
+                if item.get(field):
+                    item[field] = parse_timestamp(item[field])
+        return items
 
 class MeetTranscriptDownloader:
     """Main class for handling meeting transcript downloads"""
@@ -22,6 +87,26 @@ class MeetTranscriptDownloader:
         self.meet_integration = GoogleMeetIntegration()
         self.drive_integration = None
         self.is_authenticated = False
+        self.cache = diskcache.Cache(CACHE_DIR, disk=OrjsonDisk)
+        # Create the download directory up front so no download fails after transferring
+        self.output_dir = Path('transcripts')
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Background transcript searches started while the user picks a meeting, with their start times
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_MEETINGS)
+        self._transcript_prefetch: Dict[str, Tuple[float, Future]] = {}
+        # API requests currently running, so concurrent callers for the same data share one request
+        self._inflight: Dict[Tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Calendar fetch started while the user reads the main menu
+        self._calendar_prefetch: Optional[Future] = None
+        # Last meeting listing kept in memory so re-entering the menu skips the fetch;
+        # it expires together with the disk cache entry it mirrors
+        self._meetings_cache: Optional[List[Dict[str, Any]]] = None
+        self._meetings_cache_key: Optional[int] = None
+        self._meetings_cache_expires = 0.0
+        # Formatted listing rows for the meeting list they were built from
+        self._meeting_rows: List[str] = []
+        self._meeting_rows_source: Optional[List[Dict[str, Any]]] = None
     
     def initialize(self) -> bool:
         """
@@ -40,7 +125,8 @@ class MeetTranscriptDownloader:
             self.auth_manager.get_calendar_service()
         )
         self.drive_integration = GoogleDriveIntegration(
-            self.auth_manager.get_drive_service()
+            self.auth_manager.get_drive_service(),
+            account_key=self.auth_manager.get_account_key()
         )
         
         print("Successfully authenticated with Google APIs!")
@@ -55,16 +141,27 @@ class MeetTranscriptDownloader:
         print("Google Meet Transcript Downloader")
         print("="*60)
         
+        # Warm the meeting cache in the background; input() only blocks this thread
+        self._calendar_prefetch = self._prefetch_executor.submit(self.get_upcoming_meetings, 3)
+        
         while True:
             try:
                 self.show_main_menu()
-                choice = input("\nEnter your choice (1-3): ").strip()
+                choice = input("\nEnter your choice (1-4): ").strip()
                 
                 if choice == '1':
                     self.handle_calendar_integration()
                 elif choice == '2':
                     self.handle_direct_meeting_input()
                 elif choice == '3':
+                    self.cache.clear()
+                    self.calendar_integration.invalidate_cache()
+                    self.drive_integration.clear_cache()
+                    self._meetings_cache = None
+                    self._calendar_prefetch = None
+                    self._transcript_prefetch.clear()
+                    print("Cached meetings, transcripts and folders cleared.")
+                elif choice == '4':
                     print("Goodbye!")
                     break
                 else:
@@ -76,27 +173,41 @@ class MeetTranscriptDownloader:
             except Exception as e:
                 print(f"An error occurred: {e}")
                 print("Please try again.")
+        
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
     
     def show_main_menu(self):
         """Display the main menu"""
         print("\nMain Menu:")
         print("1. Integrate with Google Calendar")
         print("2. Enter meeting details directly")
-        print("3. Exit")
+        print("3. Refresh cached data")
+        print("4. Exit")
     
     def handle_calendar_integration(self):
         """Handle calendar integration workflow"""
         print("\nFetching meetings from Google Calendar...")
         
+        # Wait for the startup fetch so the listing below is served from memory
+        prefetch, self._calendar_prefetch = self._calendar_prefetch, None
+        if prefetch is not None:
+            try:
+                prefetch.result()
+            except Exception as e:
+                print(f"Error prefetching meetings: {e}")
+        
         # Get meetings from the past 3 months
-        meetings = self.calendar_integration.get_upcoming_meetings(months_back=3)
+        meetings = self.get_upcoming_meetings(months_back=3)
         
         if not meetings:
             print("No Google Meet meetings found in your calendar.")
             return
         
+        # Search Drive for the latest meetings' transcripts while the user reads the list
+        self.prefetch_transcripts(meetings)
+        
         print(f"\nFound {len(meetings)} Google Meet meetings:")
-        self.display_meetings(meetings)
+        self.display_meetings_page(meetings)
         
         # Let user select a meeting
         selected_meeting = self.select_meeting(meetings)
@@ -106,6 +217,108 @@ class MeetTranscriptDownloader:
         # Process the selected meeting
         self.process_meeting(selected_meeting)
     
+    def get_upcoming_meetings(self, months_back: int = 3) -> List[Dict[str, Any]]:
+        """Fetch calendar meetings, reusing a recent result from memory or the disk cache"""
+        if (self._meetings_cache and self._meetings_cache_key == months_back
+                and time.time() < self._meetings_cache_expires):
+            return self._meetings_cache
+        
+        key = ('calendar.events.list', months_back, self.auth_manager.get_account_key())
+        meetings, expires = self.cache.get(key, expire_time=True)
+        if meetings is None:
+            meetings = self._singleflight(key, self._fetch_meetings, key, months_back)
+            expires = time.time() + CALENDAR_CACHE_TTL
+        
+        if meetings:
+            self._meetings_cache = meetings
+            self._meetings_cache_key = months_back
+            self._meetings_cache_expires = expires
+        return meetings
+    
+    def search_meeting_transcripts(self, meeting: Dict[str, Any], meeting_code: str) -> List[Dict[str, Any]]:
+        """Search Drive for a meeting's transcripts, reusing a recent result from the disk cache"""
+        key = (
+            'drive.files.list', meeting_code, meeting['title'],
+            self.auth_manager.get_account_key()
+        )
+        transcripts = self.cache.get(key)
+        if transcripts is None:
+            transcripts = self._singleflight(key, self._fetch_transcripts, key, meeting, meeting_code)
+        return transcripts
+    
+    def _fetch_meetings(self, key: Tuple, months_back: int) -> List[Dict[str, Any]]:
+        """Fetch meetings from the Calendar API and store them in the disk cache"""
+        # CALENDAR_CACHE_TTL alone decides freshness here, so skip the integration's longer-lived cache
+        meetings = self.calendar_integration.get_upcoming_meetings(months_back=months_back, refresh=True)
+        # An empty list may be a failed fetch, so only cache real results
+        if meetings:
+            self.cache.set(key, meetings, expire=CALENDAR_CACHE_TTL)
+        return meetings
+    
+    def _fetch_transcripts(self, key: Tuple, meeting: Dict[str, Any], meeting_code: str) -> List[Dict[str, Any]]:
+        """Search Drive for a meeting's transcripts and store them in the disk cache"""
+        transcripts = self.drive_integration.search_meeting_transcripts(
+            meeting_code=meeting_code,
+            meeting_title=meeting['title'],
+            meeting_date=meeting['start_time']
+        )
+        if transcripts:
+            self.cache.set(key, transcripts, expire=TRANSCRIPT_CACHE_TTL)
+        return transcripts
+    
+    def _singleflight(self, key: Tuple, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) unless a call for the same key is already in flight, in which case wait for its result
+        Args:
+            key: Identifies the request; calls sharing a key share one result
+            fn: Function performing the request
+            *args: Arguments for fn
+        Returns:
+            Result of fn
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            result = fn(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def prefetch_transcripts(self, meetings: List[Dict[str, Any]]):
+        """Start background transcript searches for the most recent meetings that have already started"""
+        started = [meeting for meeting in meetings if self._has_started(meeting)]
+        now = time.time()
+        for meeting in started[:PREFETCH_MEETINGS]:
+            entry = self._transcript_prefetch.get(meeting['id'])
+            if entry is not None and now - entry[0] < TRANSCRIPT_CACHE_TTL:
+                continue
+            meeting_code = self.meet_integration.extract_meeting_code_from_url(meeting['meet_link'])
+            if meeting_code:
+                self._transcript_prefetch[meeting['id']] = (now, self._prefetch_executor.submit(
+                    self.search_meeting_transcripts, meeting, meeting_code
+                ))
+    
+    def _has_started(self, meeting: Dict[str, Any]) -> bool:
+        """Check whether a meeting's start time is in the past"""
+        start_time = meeting['start_time']
+        if not start_time:
+            return False
+        now = datetime.now(timezone.utc) if start_time.tzinfo else datetime.now()
+        return start_time <= now
+    
     def handle_direct_meeting_input(self):
         """Handle direct meeting input workflow"""
         print("\nDirect Meeting Input")
@@ -127,47 +340,90 @@ class MeetTranscriptDownloader:
         print(f"Valid Google Meet URL detected!")
         print(f"   Meeting Code: {meet_info['meeting_code']}")
         
-        # Create a mock meeting object for processing
+        # Create a mock meeting object for processing; one clock read keeps the timestamps consistent
+        now = datetime.now()
+        now_iso = now.isoformat()
         meeting_data = {
             'id': meet_info['meeting_id'],
             'title': f"Meeting {meet_info['meeting_code']}",
             'description': '',
-            'start_time': datetime.now(),
-            'end_time': datetime.now() + timedelta(hours=1),
+            'start_time': now,
+            'end_time': now + timedelta(hours=1),
             'meet_link': meet_info['meeting_url'],
             'attendees': [],
             'organizer': '',
-            'created': datetime.now().isoformat(),
-            'updated': datetime.now().isoformat()
+            'created': now_iso,
+            'updated': now_iso,
+            '_meet_info': meet_info  # Already parsed, so process_meeting can skip re-parsing the URL
         }
         
         self.process_meeting(meeting_data)
     
-    def display_meetings(self, meetings: List[Dict[str, Any]]):
-        """Display list of meetings"""
-        for i, meeting in enumerate(meetings, 1):
-            start_time = meeting['start_time'].strftime("%Y-%m-%d %H:%M") if meeting['start_time'] else "Unknown"
-            print(f"{i:2d}. {meeting['title']}")
-            print(f"    Date: {start_time}")
-            print(f"    URL: {meeting['meet_link']}")
-            if meeting['attendees']:
-                print(f"    Attendees: {len(meeting['attendees'])}")
-            print()
-    
-    def select_meeting(self, meetings: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Let user select a meeting from the list"""
+    def _format_meeting_rows(self, meetings: List[Dict[str, Any]]) -> List[str]:
+        """Format each meeting's listing entry, reusing the rows built for the same listing"""
+        if self._meeting_rows_source is not meetings:
+            rows = []
+            for i, meeting in enumerate(meetings, 1):
+                start_time = meeting['start_time'].strftime("%Y-%m-%d %H:%M") if meeting['start_time'] else "Unknown"
+                lines = [
+                    f"{i:2d}. {meeting['title']}",
+                    f"    Date: {start_time}",
+                    f"    URL: {meeting['meet_link']}"
+                ]
+                if meeting['attendees']:
+                    lines.append(f"    Attendees: {len(meeting['attendees'])}")
+                lines.append("")
+                rows.append("\n".join(lines))
+            self._meeting_rows = rows
+            self._meeting_rows_source = meetings
+        return self._meeting_rows
+    
+    def display_meetings_page(self, meetings: List[Dict[str, Any]], page: int = 0, page_size: int = MEETINGS_PAGE_SIZE):
+        """
+        Display one page of the meeting list
+        Args:
+            meetings: Meetings to list
+            page: Zero-based page number
+            page_size: Number of meetings per page
+        """
+        rows = self._format_meeting_rows(meetings)
+        page_count = -(-len(rows) // page_size)
+        # Write the whole page in one call
+        output = "\n".join(rows[page * page_size:(page + 1) * page_size])
+        if page_count > 1:
+            output += f"\nPage {page + 1} of {page_count}"
+        sys.stdout.write(output + "\n")
+        sys.stdout.flush()
+    
+    def select_meeting(self, meetings: List[Dict[str, Any]], page_size: int = MEETINGS_PAGE_SIZE) -> Optional[Dict[str, Any]]:
+        """Let user select a meeting from the list, paging through it with 'n' and 'p'"""
+        count = len(meetings)
+        page_count = -(-count // page_size)
+        page = 0
+        prompt = f"Select a meeting (1-{count}) or 'q' to quit: "
+        if page_count > 1:
+            prompt = f"Select a meeting (1-{count}), 'n'/'p' for next/previous page or 'q' to quit: "
         while True:
             try:
-                choice = input(f"Select a meeting (1-{len(meetings)}) or 'q' to quit: ").strip()
+                choice = input(prompt).strip().lower()
                 
-                if choice.lower() == 'q':
+                if choice == 'q':
                     return None
                 
+                if choice in ('n', 'p'):
+                    new_page = page + 1 if choice == 'n' else page - 1
+                    if 0 <= new_page < page_count:
+                        page = new_page
+                        self.display_meetings_page(meetings, page, page_size)
+                    else:
+                        print("No more pages in that direction")
+                    continue
+                
                 index = int(choice) - 1
-                if 0 <= index < len(meetings):
+                if 0 <= index < count:
                     return meetings[index]
                 else:
-                    print(f"Please enter a number between 1 and {len(meetings)}")
+                    print(f"Please enter a number between 1 and {count}")
                     
             except ValueError:
                 print("Please enter a valid number or 'q' to quit")
@@ -177,8 +433,11 @@ class MeetTranscriptDownloader:
         print(f"\nProcessing meeting: {meeting['title']}")
         print(f"Meeting URL: {meeting['meet_link']}")
         
-        # Extract meeting code from URL
-        meeting_code = self.meet_integration.extract_meeting_code_from_url(meeting['meet_link'])
+        # Extract meeting code from URL, reusing the parse from direct input when present
+        if '_meet_info' in meeting:
+            meeting_code = meeting['_meet_info']['meeting_code']
+        else:
+            meeting_code = self.meet_integration.extract_meeting_code_from_url(meeting['meet_link'])
         
         if not meeting_code:
             print("Could not extract meeting code from URL")
@@ -186,12 +445,16 @@ class MeetTranscriptDownloader:
         
         print(f"Searching for transcripts with meeting code: {meeting_code}")
         
-        # Search for transcripts
-        transcripts = self.drive_integration.search_meeting_transcripts(
-            meeting_code=meeting_code,
-            meeting_title=meeting['title'],
-            meeting_date=meeting['start_time']
-        )
+        # Search for transcripts, using a background search if one was started recently
+        transcripts = None
+        prefetch = self._transcript_prefetch.pop(meeting['id'], None)
+        if prefetch is not None and time.time() - prefetch[0] < TRANSCRIPT_CACHE_TTL:
+            try:
+                transcripts = prefetch[1].result()
+            except Exception as e:
+                print(f"Background transcript search failed: {e}")
+        if not transcripts:
+            transcripts = self.search_meeting_transcripts(meeting, meeting_code)
         
         if not transcripts:
             print("No transcripts found for this meeting.")
@@ -211,36 +474,41 @@ class MeetTranscriptDownloader:
     
     def display_transcripts(self, transcripts: List[Dict[str, Any]]):
         """Display list of available transcripts"""
+        # Build the whole listing first so it is written to the terminal in one call
+        lines = []
         for i, transcript in enumerate(transcripts, 1):
-            size_mb = int(transcript['size']) / (1024 * 1024) if transcript['size'] else 0
-            modified = datetime.fromisoformat(transcript['modified_time'].replace('Z', '+00:00'))
-            modified_str = modified.strftime("%Y-%m-%d %H:%M")
+            size_mb = transcript['size'] / 1048576 if transcript['size'] else 0
+            modified_str = parse_timestamp(transcript['modified_time']).strftime("%Y-%m-%d %H:%M")
             
-            print(f"{i:2d}. {transcript['name']}")
-            print(f"    Size: {size_mb:.1f} MB")
-            print(f"    Modified: {modified_str}")
+            lines.append(f"{i:2d}. {transcript['name']}")
+            lines.append(f"    Size: {size_mb:.1f} MB")
+            lines.append(f"    Modified: {modified_str}")
             if transcript.get('meeting_title'):
-                print(f"    Meeting: {transcript['meeting_title']}")
+                lines.append(f"    Meeting: {transcript['meeting_title']}")
             if transcript.get('meeting_date'):
-                print(f"    Date: {transcript['meeting_date']}")
+                lines.append(f"    Date: {transcript['meeting_date']}")
             if transcript['meeting_code']:
-                print(f"    Meeting Code: {transcript['meeting_code']}")
-            print()
+                lines.append(f"    Meeting Code: {transcript['meeting_code']}")
+            lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def select_transcript(self, transcripts: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Let user select a transcript to download"""
+        count = len(transcripts)
+        prompt = f"Select a transcript to download (1-{count}) or 'q' to quit: "
         while True:
             try:
-                choice = input(f"Select a transcript to download (1-{len(transcripts)}) or 'q' to quit: ").strip()
+                choice = input(prompt).strip()
                 
                 if choice.lower() == 'q':
                     return None
                 
                 index = int(choice) - 1
-                if 0 <= index < len(transcripts):
+                if 0 <= index < count:
                     return transcripts[index]
                 else:
-                    print(f"Please enter a number between 1 and {len(transcripts)}")
+                    print(f"Please enter a number between 1 and {count}")
                     
             except ValueError:
                 print("Please enter a valid number or 'q' to quit")
@@ -255,21 +523,18 @@ class MeetTranscriptDownloader:
         
         # Create a short filename to avoid Windows path length issues
         filename = f"{meeting_date}_{meeting_title}_transcript.docx"
-        output_path = f"transcripts/{filename}"
+        output_path = self.output_dir / filename
         
-        # Download the file
-        downloaded_path = self.drive_integration.download_transcript(
-            transcript['file_id'], 
-            output_path
+        # Download the file and fetch its preview concurrently
+        downloaded_path, content = asyncio.run(
+            self.download_transcript_async(transcript, str(output_path))
         )
         
         if downloaded_path:
             print(f"Transcript successfully downloaded to: {downloaded_path}")
             
-            # Also get the content for preview
-            content = self.drive_integration.get_transcript_content(transcript['file_id'])
             if content:
-                preview_length = min(500, len(content))
+                preview_length = min(PREVIEW_CHARS, len(content))
                 print(f"\nPreview of transcript (first {preview_length} characters):")
                 print("-" * 50)
                 print(content[:preview_length])
@@ -279,14 +544,197 @@ class MeetTranscriptDownloader:
         else:
             print("Failed to download transcript")
     
+    async def download_transcript_async(self, transcript: Dict[str, Any], output_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Download a transcript and fetch its preview text concurrently
+        Args:
+            transcript: Transcript info dictionary from the Drive search
+            output_path: Local path to save the file
+        Returns:
+            Tuple of (downloaded path or None, preview text or None)
+        """
+        results = await self.download_transcripts_async([(transcript, output_path)])
+        return results[0]
+    
+    async def download_transcripts_async(self, downloads: List[Tuple[Dict[str, Any], str]]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Download several transcripts concurrently over one authenticated session
+        Args:
+            downloads: List of (transcript info, output path) pairs
+        Returns:
+            List of (downloaded path or None, preview text or None) in the same order
+        """
+        import aiohttp
+        
+        headers = {'Authorization': f"Bearer {self.auth_manager.get_access_token()}"}
+        async with aiohttp.ClientSession(headers=headers) as session:
+            tasks = [
+                self._fetch_transcript(session, transcript, output_path)
+                for transcript, output_path in downloads
+            ]
+            return await asyncio.gather(*tasks)
+    
+    async def _fetch_transcript(self, session: 'aiohttp.ClientSession', transcript: Dict[str, Any], output_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """Download one transcript to disk and get the start of its text for a preview"""
+        file_id = transcript['file_id']
+        
+        try:
+            if transcript.get('mime_type') == GOOGLE_DOC_MIME:
+                # Google Docs are exported; the DOCX and plain-text exports are fetched together
+                export_url = f"{DRIVE_FILES_URL}/{file_id}/export"
+                downloaded_path, content = await asyncio.gather(
+                    self._stream_to_file(session, export_url, {'mimeType': DOCX_MIME}, output_path),
+                    self._fetch_text_prefix(session, export_url, {'mimeType': 'text/plain'})
+                )
+            else:
+                media_url = f"{DRIVE_FILES_URL}/{file_id}"
+                size = transcript['size']
+                downloaded_path = None
+                if size > CHUNKED_DOWNLOAD_MIN_SIZE:
+                    try:
+                        downloaded_path = await self._stream_ranges_to_file(
+                            session, media_url, {'alt': 'media'}, output_path, size
+                        )
+                    except Exception as e:
+                        print(f"Chunked download failed, retrying as a single stream: {e}")
+                if downloaded_path is None:
+                    downloaded_path = await self._stream_to_file(
+                        session, media_url, {'alt': 'media'}, output_path
+                    )
+                # The file is already on disk, so read the preview locally
+                content = self._read_local_preview(downloaded_path, transcript)
+            
+            return downloaded_path, content
+            
+        except Exception as e:
+            print(f"Error downloading transcript: {e}")
+            return None, None
+    
+    async def _stream_to_file(self, session: 'aiohttp.ClientSession', url: str, params: Dict[str, str], output_path: str) -> str:
+        """Stream a Drive response body to disk in 1 MiB chunks"""
+        # Write to a temp name and rename once complete so failures leave no partial file
+        part_path = f"{output_path}.part"
+        try:
+            async with session.get(url, params=params) as resp:
+                resp.raise_for_status()
+                with open(part_path, 'wb') as f:
+                    async for chunk in resp.content.iter_chunked(1 << 20):
+                        f.write(chunk)
+            os.replace(part_path, output_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        return output_path
+    
+    async def _stream_ranges_to_file(self, session: 'aiohttp.ClientSession', url: str, params: Dict[str, str], output_path: str, size: int) -> str:
+        """
+        Download a file as DOWNLOAD_CHUNKS concurrent byte ranges
+        Each range is written in place into a temp file preallocated to the full size
+        Args:
+            session: Authenticated HTTP session
+            url: Drive media URL
+            params: Query parameters for the request
+            output_path: Local path to save the file
+            size: File size in bytes
+        Returns:
+            Path to downloaded file
+        """
+        chunk_size = -(-size // DOWNLOAD_CHUNKS)
+        part_path = f"{output_path}.part"
+        with open(part_path, 'wb') as f:
+            f.truncate(size)
+        
+        tasks = [
+            asyncio.ensure_future(
+                self._stream_range(session, url, params, part_path, start, min(start + chunk_size, size) - 1)
+            )
+            for start in range(0, size, chunk_size)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+            os.replace(part_path, output_path)
+        except BaseException:
+            # Stop the other ranges so none of them writes into the file after the caller falls back
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        return output_path
+    
+    async def _stream_range(self, session: 'aiohttp.ClientSession', url: str, params: Dict[str, str], output_path: str, start: int, end: int):
+        """Stream one byte range of a Drive response into its position in the output file"""
+        headers = {'Range': f'bytes={start}-{end}'}
+        async with session.get(url, params=params, headers=headers) as resp:
+            resp.raise_for_status()
+            if resp.status != 206:
+                raise RuntimeError("server ignored the Range header")
+            with open(output_path, 'r+b') as f:
+                f.seek(start)
+                async for chunk in resp.content.iter_chunked(1 << 20):
+                    f.write(chunk)
+    
+    async def _fetch_text_prefix(self, session: 'aiohttp.ClientSession', url: str, params: Dict[str, str]) -> Optional[str]:
+        """Fetch the first PREVIEW_BYTES of a Drive response as text, or None if the request fails"""
+        try:
+            headers = {'Range': f'bytes=0-{PREVIEW_BYTES - 1}'}
+            async with session.get(url, params=params, headers=headers) as resp:
+                resp.raise_for_status()
+                # read() returns only what is buffered, so keep reading until the preview
+                # is filled or the body ends; servers that ignore Range send everything
+                data = bytearray()
+                while len(data) < PREVIEW_BYTES:
+                    chunk = await resp.content.read(PREVIEW_BYTES - len(data))
+                    if not chunk:
+                        break
+                    data += chunk
+                return data.decode('utf-8', errors='ignore')
+        except Exception as e:
+            print(f"Error fetching transcript content: {e}")
+            return None
+    
+    def _read_local_preview(self, path: str, transcript: Dict[str, Any]) -> Optional[str]:
+        """Extract the start of a downloaded transcript's text"""
+        try:
+            if transcript['name'].endswith('.docx') or 'docx' in transcript.get('mime_type', ''):
+                return self._read_docx_preview(path, PREVIEW_CHARS)
+            
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read(PREVIEW_CHARS + 1)
+        except Exception as e:
+            print(f"Error reading transcript content: {e}")
+            return None
+    
+    def _read_docx_preview(self, path: str, max_chars: int) -> str:
+        """
+        Stream-parse a .docx body, stopping once more than max_chars of text is collected
+        Args:
+            path: Path to the .docx file
+            max_chars: Number of characters needed
+        Returns:
+            Text of the leading paragraphs
+        """
+        parts = []
+        length = 0
+        with zipfile.ZipFile(path) as docx, docx.open('word/document.xml') as xml:
+            for _, elem in ElementTree.iterparse(xml):
+                if elem.tag == _W_NS + 't' and elem.text:
+                    parts.append(elem.text)
+                    length += len(elem.text)
+                elif elem.tag == _W_NS + 'p':
+                    parts.append('\n')
+                    length += 1
+                    elem.clear()
+                if length > max_chars:
+                    break
+        return ''.join(parts).rstrip('\n')
+    
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for filesystem compatibility"""
-        import re
-        # Remove or replace invalid characters
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        # Remove extra spaces and limit length
-        filename = re.sub(r'\s+', '_', filename.strip())
-        return filename[:100]  # Increased limit to 100 characters
+        # Replace invalid characters, collapse spaces and limit length to 100 characters
+        return _WHITESPACE.sub('_', _INVALID_FS_CHARS.sub('_', filename).strip())[:100]
 
 def main():
     """Main entry point"""
@@ -299,9 +747,6 @@ def main():
         print("Use env_template.txt as a reference.")
         return
     
-    # Create transcripts directory
-    os.makedirs('transcripts', exist_ok=True)
-    
     # Run the application
     app = MeetTranscriptDownloader()
     app.run()
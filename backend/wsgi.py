@@ -0,0 +1,11 @@
+"""
+WSGI Entrypoint for Google Meet Transcript Downloader
+Exposes the Flask app for production WSGI servers, e.g.:
+
+    gunicorn -w 1 -k gthread --threads 8 wsgi:app
+
+Authentication state lives in the worker process, so scale with threads
+rather than additional worker processes.
+"""
+
+from app import app
@@ -31,11 +31,9 @@ function App() {
   const handleLogin = async () => {
     setIsLoading(true);
     try {
+      // No body or custom headers, so the browser can skip the CORS preflight
       const response = await fetch(`${API_BASE_URL}/auth/login`, {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
       });
       const data = await response.json();
       